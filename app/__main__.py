@@ -58,7 +58,12 @@ class MainMenu:
         # Marco principal
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=30, pady=30)
-        
+
+        # Fuentes compartidas: cada CTkFont se crea una sola vez y se
+        # reutiliza en todos los widgets que comparten estilo
+        button_font = ctk.CTkFont(size=18, weight="bold")
+        desc_font = ctk.CTkFont(size=14)
+
         # Título
         title_label = ctk.CTkLabel(
             main_frame, 
@@ -84,7 +89,7 @@ class MainMenu:
             button_frame,
             text="✍️ Escribir en mi Diario",
             command=self.open_diary,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=button_font,
             height=60,
             width=400
         )
@@ -94,7 +99,7 @@ class MainMenu:
         new_diary_desc = ctk.CTkLabel(
             button_frame,
             text="Graba voz o escribe texto para registrar\ntus emociones en tiempo real",
-            font=ctk.CTkFont(size=14),
+            font=desc_font,
             text_color="gray"
         )
         new_diary_desc.pack(pady=(0, 25))
@@ -104,7 +109,7 @@ class MainMenu:
             button_frame,
             text="📚 Ver mi Historial",
             command=self.open_viewer,
-            font=ctk.CTkFont(size=18, weight="bold"),
+            font=button_font,
             height=60,
             width=400
         )
@@ -114,7 +119,7 @@ class MainMenu:
         view_diary_desc = ctk.CTkLabel(
             button_frame,
             text="Revisa tus entradas pasadas, busca por emociones\ny visualiza estadísticas de tu estado emocional",
-            font=ctk.CTkFont(size=14),
+            font=desc_font,
             text_color="gray"
         )
         view_diary_desc.pack(pady=(0, 25))
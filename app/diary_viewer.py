@@ -90,7 +90,21 @@ class DiaryViewerApp:
             'disgust': '#795548',  # Marrón
             'Input': '#607D8B'     # Azul gris
         }
-        
+
+        # Emojis para emociones (construido una vez; get_emotion_emoji se
+        # llama por cada entrada al refrescar la lista)
+        self.emotion_emojis = {
+            'joy': '😊',
+            'sadness': '😢',
+            'anger': '😠',
+            'fear': '😰',
+            'surprise': '😲',
+            'neutral': '😐',
+            'disgust': '🤢',
+            'Input': '💭'
+        }
+
+
         # Construir interfaz
         self.build_ui()
         self.load_diary_entries()
@@ -103,7 +117,11 @@ class DiaryViewerApp:
         # Marco principal
         main_frame = ctk.CTkFrame(self.window)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        
+
+        # Fuentes compartidas entre los widgets que usan el mismo estilo
+        section_font = ctk.CTkFont(size=16, weight="bold")
+        body_font = ctk.CTkFont(size=12)
+
         # Panel superior - Controles
         control_frame = ctk.CTkFrame(main_frame)
         control_frame.pack(fill="x", padx=10, pady=(10, 5))
@@ -172,8 +190,8 @@ class DiaryViewerApp:
         left_frame = ctk.CTkFrame(content_frame)
         left_frame.pack(side="left", fill="both", expand=True, padx=(10, 5), pady=10)
         
-        entries_label = ctk.CTkLabel(left_frame, text="Entradas del Diario", 
-                                   font=ctk.CTkFont(size=16, weight="bold"))
+        entries_label = ctk.CTkLabel(left_frame, text="Entradas del Diario",
+                                   font=section_font)
         entries_label.pack(pady=(10, 5))
         
         # Lista de entradas con scrollbar
@@ -191,19 +209,19 @@ class DiaryViewerApp:
         right_frame = ctk.CTkFrame(content_frame)
         right_frame.pack(side="right", fill="both", expand=True, padx=(5, 10), pady=10)
         
-        details_label = ctk.CTkLabel(right_frame, text="Detalles de la Entrada", 
-                                   font=ctk.CTkFont(size=16, weight="bold"))
+        details_label = ctk.CTkLabel(right_frame, text="Detalles de la Entrada",
+                                   font=section_font)
         details_label.pack(pady=(10, 5))
         
         # Área de detalles
-        self.details_text = ctk.CTkTextbox(right_frame, wrap="word", font=ctk.CTkFont(size=12))
+        self.details_text = ctk.CTkTextbox(right_frame, wrap="word", font=body_font)
         self.details_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
         # Panel inferior - Información de resumen
         summary_frame = ctk.CTkFrame(main_frame)
         summary_frame.pack(fill="x", padx=10, pady=(0, 10))
         
-        self.summary_label = ctk.CTkLabel(summary_frame, text="", font=ctk.CTkFont(size=12))
+        self.summary_label = ctk.CTkLabel(summary_frame, text="", font=body_font)
         self.summary_label.pack(pady=10)
         
     def load_diary_entries(self):
@@ -292,17 +310,7 @@ class DiaryViewerApp:
         """
         Retorna el emoji correspondiente a una emoción.
         """
-        emoji_map = {
-            'joy': '😊',
-            'sadness': '😢',
-            'anger': '😠',
-            'fear': '😰',
-            'surprise': '😲',
-            'neutral': '😐',
-            'disgust': '🤢',
-            'Input': '💭'
-        }
-        return emoji_map.get(emotion, '❓')
+        return self.emotion_emojis.get(emotion, '❓')
     
     def on_entry_select(self, event):
         """
@@ -20,6 +20,7 @@ Dependencias:
 """
 
 # Análisis emocional del texto (NLP)
+import functools
 import torch
 import joblib
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
@@ -38,6 +39,9 @@ device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 model.to(device)
 model.eval()
 
+# Caché de predicciones: el mismo texto (reintentos, reenvíos) devuelve
+# la emoción memorizada en microsegundos en vez de repetir el forward pass
+@functools.lru_cache(maxsize=1024)
 def predict_emotion(text):
     """
     Predice la emoción predominante en un texto dado.
@@ -67,6 +71,35 @@ def predict_emotion(text):
     predicted_emotion = label_encoder.inverse_transform([predicted_class_id])[0]
     return predicted_emotion
 
+def predict_emotions(texts):
+    """
+    Predice las emociones de varios textos en un solo forward pass.
+
+    El costo de una inferencia del transformer crece poco con el tamaño
+    del lote, así que N textos en un lote cuestan mucho menos que N
+    llamadas individuales a predict_emotion.
+
+    Args:
+        texts (list[str]): Textos de entrada para analizar
+
+    Returns:
+        list[str]: Emociones detectadas, en el mismo orden que los textos
+    """
+    if not texts:
+        return []
+
+    # Tokenizar el lote completo con padding dinámico al texto más largo
+    inputs = tokenizer(list(texts), return_tensors="pt", truncation=True, padding=True, max_length=128)
+    inputs = {k: v.to(device) for k, v in inputs.items()}
+
+    # Predecir
+    with torch.no_grad():
+        logits = model(**inputs).logits
+        predicted_class_ids = torch.argmax(logits, dim=1).cpu().numpy()
+
+    # Decodificar las etiquetas
+    return list(label_encoder.inverse_transform(predicted_class_ids))
+
 # === Ejemplo de uso ===
 if __name__ == "__main__":
     text_input = "Me siento muy feliz hoy"
@@ -23,15 +23,20 @@ Clases:
     - EmpatheticResponseGenerator: Generador principal de respuestas empáticas
 """
 
+from __future__ import annotations
+
+import os
 import re
 import random
-from typing import Dict, List
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+from typing import TYPE_CHECKING
 from collections import Counter
-import string
+
+# NLTK se importa de forma lazy dentro de las funciones que lo usan para
+# que importar este módulo no pague el costo de cargar toda la librería
+
+if TYPE_CHECKING:
+    # Solo necesarias para las anotaciones de tipo, no en tiempo de ejecución
+    from typing import Dict, List
 
 # Función para descargar recursos necesarios de NLTK
 def download_nltk_resources():
@@ -47,14 +52,51 @@ def download_nltk_resources():
     Esta función verifica primero si cada recurso existe antes de descargarlo,
     evitando descargas innecesarias en ejecuciones posteriores.
     """
-    resources = ['punkt', 'stopwords', 'wordnet', 'omw-1.4']
-    for resource in resources:
+    import nltk
+
+    # Rutas reales de cada recurso dentro del árbol de datos de NLTK;
+    # usar solo el nombre hacía fallar la búsqueda y repetía descargas
+    resources = {
+        'punkt': 'tokenizers/punkt',
+        'stopwords': 'corpora/stopwords',
+        'wordnet': 'corpora/wordnet',
+        'omw-1.4': 'corpora/omw-1.4'
+    }
+    for resource, resource_path in resources.items():
         try:
-            nltk.data.find(resource)
+            nltk.data.find(resource_path)
         except LookupError:
             nltk.download(resource)
 
-download_nltk_resources()
+# Herramientas NLP compartidas a nivel de módulo
+# El generador no usa actualmente el lematizador ni las stopwords, así que
+# NLTK no se carga ni al importar el módulo ni al construir instancias;
+# solo si algún consumidor accede a estos atributos se paga su costo
+_STOPWORDS = None
+_LEMMATIZER = None
+
+def _load_nltk_tools():
+    """
+    Carga (una sola vez) las stopwords y el lematizador compartidos.
+
+    Verifica/descarga los recursos necesarios antes de leer el corpus
+    (salvo que NLTK_NO_DOWNLOAD esté definida) y cachea ambos objetos a
+    nivel de módulo para que todas las instancias los compartan.
+    """
+    global _STOPWORDS, _LEMMATIZER
+    if _STOPWORDS is None:
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+
+        if not os.environ.get('NLTK_NO_DOWNLOAD'):
+            download_nltk_resources()
+        _STOPWORDS = frozenset(stopwords.words('english'))
+        _LEMMATIZER = WordNetLemmatizer()
+    return _STOPWORDS, _LEMMATIZER
+
+# Tamaño máximo de las cachés de análisis por texto; al alcanzarlo la caché
+# se vacía para mantener acotado el uso de memoria en sesiones largas
+_ANALYSIS_CACHE_MAXSIZE = 512
 
 class EmpatheticResponseGenerator:
     """
@@ -86,9 +128,19 @@ class EmpatheticResponseGenerator:
         Inicializa el generador de respuestas empáticas con todas las configuraciones
         y diccionarios necesarios para el análisis y generación de respuestas.
         """
-        # Herramientas de procesamiento de lenguaje natural
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        # Generador aleatorio propio de la instancia
+        # Evita el lock del generador global de random y permite sembrarlo
+        # para obtener respuestas reproducibles en pruebas
+        self._rng = random.Random()
+
+        # Cachés de análisis por texto
+        # identify_context, generate_context_summary y
+        # calculate_emotional_intensity son funciones puras del texto y se
+        # invocan varias veces por respuesta generada, por lo que memorizar
+        # su resultado evita repetir el análisis completo
+        self._context_cache = {}
+        self._intensity_cache = {}
+        self._summary_cache = {}
 
 
         # Diccionario de palabras de intensidad emocional
@@ -100,6 +152,23 @@ class EmpatheticResponseGenerator:
             'low': ['a bit', 'slightly', 'kind of', 'sort of', 'a little']
         }
 
+        # Conjuntos precalculados de palabras de intensidad
+        # Permiten puntuar por intersección con el contador de tokens del
+        # texto en lugar de buscar cada palabra como subcadena
+        self._high_intensity_set = frozenset(self.intensity_words['high'])
+        self._medium_intensity_set = frozenset(self.intensity_words['medium'])
+
+        # Regex precompilado para detectar letras repetidas (p. ej. "nooo")
+        self._repeat_re = re.compile(r'(.)\1{2,}')
+
+        # Regex reutilizados por el resumen contextual
+        self._sentence_split_re = re.compile(r'[.!?]\s+')
+        self._leading_you_re = re.compile(r'^(you\s+)', re.IGNORECASE)
+        self._word_re = re.compile(r"[a-z']+")
+        # Mismo alfabeto que _word_re: define qué caracteres forman palabra
+        # para la prueba de límites del autómata de contextos
+        self._word_chars = frozenset("abcdefghijklmnopqrstuvwxyz'")
+
         # Mapeo de emociones específicas a categorías generales
         # Facilita el manejo de emociones variadas agrupándolas en categorías principales
         self.emotion_mapping = {
@@ -117,6 +186,32 @@ class EmpatheticResponseGenerator:
             'confusion': 'neutral', 'surprise': 'neutral', 'neutral': 'neutral'
         }
 
+        # Descripciones estáticas para los resúmenes de contexto: se
+        # construyen una vez aquí en lugar de rearmar los literales en
+        # cada llamada de _generate_*_context_summary
+        self.specific_context_summaries = {
+            'work_stress': "the intense pressure and demands you're facing at work",
+            'work_conflict': "the difficult situation you're dealing with at your workplace",
+            'relationship_conflict': "the tensions and disagreements in your relationship",
+            'relationship_loss': "the painful end of your relationship",
+            'health_concern': "the health issues you're worried about",
+            'academic_pressure': "the academic stress and pressure you're under",
+            'financial_stress': "the financial difficulties you're going through",
+            'personal_growth': "the personal changes and growth you're experiencing",
+            'life_transition': "the major life changes you're navigating"
+        }
+
+        self.general_context_descriptions = {
+            'work': "your work situation",
+            'relationship': "your relationship situation",
+            'health': "your health concerns",
+            'school': "your academic situation",
+            'financial': "your financial concerns",
+            'personal': "what you're going through personally",
+            'life_events': "this important event in your life",
+            'loss_grief': "the loss you're experiencing"
+        }
+
         # Patrones de respuesta empática mejorados para cada emoción
         # Cada emoción tiene múltiples patrones más naturales y contextualizados
         self.empathetic_patterns = {
@@ -194,10 +289,52 @@ class EmpatheticResponseGenerator:
             ]
         }
 
+        # Patrones preprocesados para la generación de respuestas
+        # Cada patrón se divide una sola vez alrededor de '{context}' en un
+        # par (prefijo, sufijo), de modo que la respuesta se arma por
+        # concatenación sin re-analizar la cadena de formato en cada llamada
+        self._pattern_parts = {
+            emotion: tuple(tuple(pattern.split('{context}', 1)) for pattern in patterns)
+            for emotion, patterns in self.empathetic_patterns.items()
+        }
+
+        # Subconjunto de patrones "fuertes" por emoción, precalculado para
+        # la selección de alta intensidad (antes se filtraba en cada llamada)
+        strong_words = ('really', 'completely', 'absolutely', 'deeply',
+                        'truly', 'so', 'incredibly')
+        self._strong_pattern_parts = {}
+        for emotion, patterns in self.empathetic_patterns.items():
+            strong = tuple(tuple(pattern.split('{context}', 1)) for pattern in patterns
+                           if any(word in pattern.lower() for word in strong_words))
+            if strong:
+                self._strong_pattern_parts[emotion] = strong
+
+        # Transiciones suaves para respuestas de intensidad baja o media
+        self._soft_transitions = ("", "I'm curious, ", "I wonder, ",
+                                  "If you don't mind me asking, ")
+
+        # Tabla plana de palabras clave para el fallback de emociones
+        # negativas; el orden de las entradas define la prioridad, por lo
+        # que basta una pasada para resolver toda la cascada de elif
+        self._negative_fallback_keywords = (
+            ('frustrated', 'anger'), ('angry', 'anger'),
+            ('mad', 'anger'), ('infuriated', 'anger'),
+            ('sad', 'sadness'), ('depressed', 'sadness'),
+            ('heartbroken', 'sadness'), ('devastated', 'sadness'),
+            ('scared', 'fear'), ('afraid', 'fear'), ('worried', 'fear'),
+            ('anxious', 'fear'), ('nervous', 'fear'),
+            ('disappointed', 'disappointment'), ('let down', 'disappointment'),
+            ('expected', 'disappointment'), ('hoped', 'disappointment'),
+            ('embarrassed', 'embarrassment'), ('ashamed', 'embarrassment'),
+            ('humiliated', 'embarrassment'), ('mortified', 'embarrassment'),
+            ('disgusted', 'disgust'), ('repulsed', 'disgust'),
+            ('sick', 'disgust'), ('revolting', 'disgust')
+        )
+
         # Frases de seguimiento mejoradas basadas en intensidad emocional
         # Proporcionan continuidad apropiada y más natural según el nivel de emoción detectado
         self.follow_up_phrases = {
-            'high_intensity': [
+            'high_intensity': (
                 "Would you like to talk more about this?",
                 "How are you coping with everything right now?",
                 "Is there anything specific that might help you feel better?",
@@ -206,8 +343,8 @@ class EmpatheticResponseGenerator:
                 "Do you have people around you who understand what you're going through?",
                 "How long have you been dealing with feelings this intense?",
                 "What usually helps you when things feel this overwhelming?"
-            ],
-            'medium_intensity': [
+            ),
+            'medium_intensity': (
                 "How are you feeling about everything overall?",
                 "Would you like to share more about your experience?",
                 "What's been on your mind lately about this?",
@@ -216,8 +353,8 @@ class EmpatheticResponseGenerator:
                 "Have you been able to process these feelings with anyone?",
                 "What aspects of this situation feel most challenging?",
                 "How has this been affecting your daily life?"
-            ],
-            'low_intensity': [
+            ),
+            'low_intensity': (
                 "Thanks for sharing this with me.",
                 "I'm here if you need to talk more about it.",
                 "How has your day been overall?",
@@ -226,7 +363,7 @@ class EmpatheticResponseGenerator:
                 "Is there anything else you'd like to explore?",
                 "What other thoughts or feelings have come up for you?",
                 "How do you usually handle situations like this?"
-            ]
+            )
         }
 
         # Palabras clave expandidas para identificación de contexto temático más precisa
@@ -271,6 +408,111 @@ class EmpatheticResponseGenerator:
             'life_transition': ['moving', 'new job', 'starting', 'ending', 'change']
         }
 
+        # Cota superior de puntuación por categoría de contexto
+        # Cada palabra clave aporta como máximo 3 puntos (coincidencia de
+        # palabra completa), lo que permite cortar el análisis cuando el
+        # líder actual ya es inalcanzable para las categorías restantes
+        self._context_max_scores = {
+            context: 3 * len(keywords)
+            for context, keywords in self.context_keywords.items()
+        }
+
+        # Palabras clave separadas por forma: las de un solo token se
+        # comparan por intersección de conjuntos (bucle en C) y las frases
+        # de varias palabras quedan para la búsqueda por subcadena
+        self._single_token_keywords = {
+            context: frozenset(k for k in keywords if ' ' not in k)
+            for context, keywords in self.context_keywords.items()
+        }
+        self._multi_token_keywords = {
+            context: tuple(k for k in keywords if ' ' in k)
+            for context, keywords in self.context_keywords.items()
+        }
+
+        # Autómata Aho-Corasick opcional para identify_context
+        # Permite encontrar todas las palabras clave en una sola pasada
+        # sobre el texto en lugar de ~150 búsquedas de subcadena; si
+        # pyahocorasick no está instalado se usa el barrido por categoría
+        self._ctx_automaton = None
+        try:
+            import ahocorasick
+        except ImportError:
+            pass
+        else:
+            # Una misma palabra clave puede pertenecer a varias categorías
+            keyword_contexts = {}
+            for context, keywords in self.context_keywords.items():
+                for keyword in keywords:
+                    keyword_contexts.setdefault(keyword, []).append(context)
+
+            automaton = ahocorasick.Automaton()
+            for keyword, contexts in keyword_contexts.items():
+                automaton.add_word(keyword, (keyword, tuple(contexts)))
+            automaton.make_automaton()
+            self._ctx_automaton = automaton
+
+        # Conversiones de primera a segunda persona (claves en minúsculas)
+        # Se compilan en un único regex con alternativas ordenadas de mayor a
+        # menor longitud para que las frases ganen a las palabras sueltas
+        self._person_conversions = {
+            'i am': 'you are',
+            'i\'m': 'you\'re',
+            'i was': 'you were',
+            'i have': 'you have',
+            'i\'ve': 'you\'ve',
+            'i had': 'you had',
+            'i\'d': 'you\'d',
+            'i will': 'you will',
+            'i\'ll': 'you\'ll',
+            'i can\'t': 'you can\'t',
+            'i can': 'you can',
+            'i cannot': 'you cannot',
+            'i don\'t': 'you don\'t',
+            'i do': 'you do',
+            'i didn\'t': 'you didn\'t',
+            'i did': 'you did',
+            'i feel': 'you feel',
+            'i think': 'you think',
+            'i know': 'you know',
+            'i want': 'you want',
+            'i need': 'you need',
+            'i like': 'you like',
+            'i love': 'you love',
+            'i hate': 'you hate',
+            'i get': 'you get',
+            'i got': 'you got',
+            'i went': 'you went',
+            'i go': 'you go',
+            'i see': 'you see',
+            'i saw': 'you saw',
+            'i hear': 'you hear',
+            'i heard': 'you heard',
+            'i': 'you',
+            'me': 'you',
+            'my': 'your',
+            'mine': 'yours',
+            'myself': 'yourself'
+        }
+        self._person_pattern = re.compile(
+            r'\b(?:' + '|'.join(sorted(map(re.escape, self._person_conversions),
+                                       key=len, reverse=True)) + r')\b',
+            re.IGNORECASE
+        )
+
+    @property
+    def stop_words(self):
+        """
+        Stopwords en inglés de NLTK, cargadas solo en el primer acceso.
+        """
+        return _load_nltk_tools()[0]
+
+    @property
+    def lemmatizer(self):
+        """
+        Lematizador de WordNet, cargado solo en el primer acceso.
+        """
+        return _load_nltk_tools()[1]
+
     def identify_context(self, text: str) -> Dict[str, any]:
         """
         Identifica el contexto temático principal del texto con análisis más detallado.
@@ -296,7 +538,38 @@ class EmpatheticResponseGenerator:
             4. Detecta elementos emocionales y temporales
             5. Retorna información contextual completa
         """
-        text_lower = text.lower()
+        return self._identify_context(text, text.lower())
+
+    def _is_whole_word_match(self, keyword: str, text_lower: str) -> bool:
+        """
+        Comprueba si keyword aparece delimitada por no-letras en el texto.
+
+        Aplica el mismo criterio de límite que _word_re y que el camino
+        del autómata: cualquier carácter fuera de [a-z'] delimita palabra,
+        de modo que ambos caminos de _identify_context puntúan igual.
+        """
+        end_limit = len(text_lower)
+        start = text_lower.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            if ((start == 0 or text_lower[start - 1] not in self._word_chars)
+                    and (end == end_limit or text_lower[end] not in self._word_chars)):
+                return True
+            start = text_lower.find(keyword, start + 1)
+        return False
+
+    def _identify_context(self, text: str, text_lower: str) -> Dict[str, any]:
+        """
+        Implementación de identify_context con el texto ya en minúsculas.
+
+        Recibe la versión en minúsculas precalculada para que los métodos
+        que encadenan varios análisis sobre el mismo texto no repitan la
+        conversión completa en cada paso.
+        """
+        cached = self._context_cache.get(text)
+        if cached is not None:
+            return cached
+
         context_scores = {}
         detected_patterns = []
         key_elements = []
@@ -304,20 +577,68 @@ class EmpatheticResponseGenerator:
         temporal_indicators = {'past': False, 'present': False, 'future': False}
         
         # Análisis básico de categorías con pesos mejorados
-        for context, keywords in self.context_keywords.items():
-            score = 0
-            found_keywords = []
-            for keyword in keywords:
-                if f' {keyword} ' in f' {text_lower} ':
-                    score += 3  # Palabra completa tiene mayor peso
-                    found_keywords.append(keyword)
-                elif keyword in text_lower:
-                    score += 1  # Palabra parcial tiene menor peso
-                    found_keywords.append(keyword)
-            
-            if score > 0:
-                context_scores[context] = score
-                key_elements.extend(found_keywords)
+        if self._ctx_automaton is not None:
+            # Una sola pasada del autómata encuentra todas las palabras
+            # clave; cada una puntúa +3 si aparece como palabra completa
+            # y +1 si solo aparece como subcadena. El límite de palabra es
+            # el mismo que usa la tokenización del barrido (_word_re):
+            # cualquier carácter fuera de [a-z'] delimita, de modo que
+            # ambos caminos producen puntuaciones idénticas
+            matched = {}
+            word_chars = self._word_chars
+            last_index = len(text_lower) - 1
+            for end_idx, (keyword, contexts) in self._ctx_automaton.iter(text_lower):
+                start_idx = end_idx - len(keyword) + 1
+                whole_word = ((start_idx == 0 or text_lower[start_idx - 1] not in word_chars)
+                              and (end_idx == last_index or text_lower[end_idx + 1] not in word_chars))
+                previous = matched.get(keyword)
+                if previous is None or (whole_word and not previous[0]):
+                    matched[keyword] = (whole_word, contexts)
+
+            for keyword, (whole_word, contexts) in matched.items():
+                weight = 3 if whole_word else 1
+                for context in contexts:
+                    context_scores[context] = context_scores.get(context, 0) + weight
+                    key_elements.append(keyword)
+        else:
+            # Se recorren las categorías de mayor a menor puntuación posible
+            # para poder terminar antes cuando el líder es inalcanzable
+            ordered_contexts = sorted(self.context_keywords,
+                                      key=self._context_max_scores.get, reverse=True)
+            remaining_cap = sum(self._context_max_scores.values())
+            leader_score = 0
+            # El texto se tokeniza una sola vez: la prueba de palabra
+            # completa pasa a ser pertenencia a un conjunto en lugar de
+            # construir cadenas acolchonadas por cada palabra clave
+            words = set(self._word_re.findall(text_lower))
+            for context in ordered_contexts:
+                remaining_cap -= self._context_max_scores[context]
+                # Las coincidencias de palabra completa se resuelven con una
+                # sola intersección de conjuntos (bucle en C) en lugar de
+                # iterar palabra por palabra en Python
+                whole_matches = words & self._single_token_keywords[context]
+                score = 3 * len(whole_matches)  # Palabra completa tiene mayor peso
+                found_keywords = list(whole_matches)
+                for keyword in self._single_token_keywords[context]:
+                    if keyword not in whole_matches and keyword in text_lower:
+                        score += 1  # Palabra parcial tiene menor peso
+                        found_keywords.append(keyword)
+                for keyword in self._multi_token_keywords[context]:
+                    if keyword in text_lower:
+                        if self._is_whole_word_match(keyword, text_lower):
+                            score += 3
+                        else:
+                            score += 1
+                        found_keywords.append(keyword)
+
+                if score > 0:
+                    context_scores[context] = score
+                    key_elements.extend(found_keywords)
+                    leader_score = max(leader_score, score)
+
+                # Ninguna categoría pendiente puede alcanzar al líder actual
+                if leader_score > remaining_cap:
+                    break
         
         # Análisis de patrones contextuales específicos
         for pattern_name, pattern_words in self.context_patterns.items():
@@ -352,7 +673,7 @@ class EmpatheticResponseGenerator:
         if relevant_patterns:
             sub_context = relevant_patterns[0]
         
-        return {
+        result = {
             'main_context': main_context,
             'sub_context': sub_context,
             'key_elements': list(set(key_elements)),
@@ -361,6 +682,10 @@ class EmpatheticResponseGenerator:
             'detected_patterns': detected_patterns,
             'context_score': context_scores.get(main_context, 0)
         }
+        if len(self._context_cache) >= _ANALYSIS_CACHE_MAXSIZE:
+            self._context_cache.clear()
+        self._context_cache[text] = result
+        return result
 
     def extract_key_phrases(self, text: str, context_info: Dict[str, any]) -> List[str]:
         """
@@ -377,7 +702,13 @@ class EmpatheticResponseGenerator:
             List[str]: Lista de frases clave extraídas y procesadas
         """
         # Tokenizar el texto en oraciones
-        sentences = re.split(r'[.!?]\s+', text.strip())
+        # Atajo para entradas cortas de una sola oración (lo habitual en la
+        # GUI): sin puntuación de cierre no hace falta invocar el regex
+        stripped = text.strip()
+        if '.' not in stripped and '!' not in stripped and '?' not in stripped:
+            sentences = [stripped]
+        else:
+            sentences = self._sentence_split_re.split(stripped)
         key_phrases = []
         
         # Filtrar oraciones significativas (más de 3 palabras)
@@ -424,7 +755,20 @@ class EmpatheticResponseGenerator:
         Returns:
             str: Resumen contextual natural para usar en respuestas
         """
-        context_info = self.identify_context(text)
+        return self._generate_context_summary(text, text.lower())
+
+    def _generate_context_summary(self, text: str, text_lower: str) -> str:
+        """
+        Implementación de generate_context_summary con el texto ya en minúsculas.
+
+        El resumen es una función determinista del texto, por lo que se
+        memoriza junto con el resto de análisis por texto.
+        """
+        cached = self._summary_cache.get(text)
+        if cached is not None:
+            return cached
+
+        context_info = self._identify_context(text, text_lower)
         main_context = context_info['main_context']
         sub_context = context_info['sub_context']
         key_elements = context_info['key_elements']
@@ -439,7 +783,10 @@ class EmpatheticResponseGenerator:
             summary = self._generate_specific_context_summary(main_context, sub_context, key_phrases, emotional_triggers, temporal_indicators)
         else:
             summary = self._generate_general_context_summary(main_context, key_phrases, key_elements, emotional_triggers, temporal_indicators)
-        
+
+        if len(self._summary_cache) >= _ANALYSIS_CACHE_MAXSIZE:
+            self._summary_cache.clear()
+        self._summary_cache[text] = summary
         return summary
 
     def _generate_specific_context_summary(self, main_context: str, sub_context: str, 
@@ -448,18 +795,8 @@ class EmpatheticResponseGenerator:
         """Genera resumen para contextos específicos identificados."""
         
         # Mapeo de sub-contextos a descripciones naturales
-        specific_summaries = {
-            'work_stress': "the intense pressure and demands you're facing at work",
-            'work_conflict': "the difficult situation you're dealing with at your workplace",
-            'relationship_conflict': "the tensions and disagreements in your relationship",
-            'relationship_loss': "the painful end of your relationship",
-            'health_concern': "the health issues you're worried about",
-            'academic_pressure': "the academic stress and pressure you're under",
-            'financial_stress': "the financial difficulties you're going through",
-            'personal_growth': "the personal changes and growth you're experiencing",
-            'life_transition': "the major life changes you're navigating"
-        }
-        
+        specific_summaries = self.specific_context_summaries
+
         if sub_context in specific_summaries:
             base_summary = specific_summaries[sub_context]
         else:
@@ -490,7 +827,7 @@ class EmpatheticResponseGenerator:
             converted_phrase = self.convert_to_second_person(best_phrase)
             
             # Limpiar y simplificar la frase
-            converted_phrase = re.sub(r'^(you\s+)', '', converted_phrase, flags=re.IGNORECASE).strip()
+            converted_phrase = self._leading_you_re.sub('', converted_phrase).strip()
             converted_phrase = converted_phrase.lower()
             
             # Asegurar que comience de manera natural
@@ -500,18 +837,7 @@ class EmpatheticResponseGenerator:
             return converted_phrase
         
         # Fallback a descripciones contextuales generales
-        context_descriptions = {
-            'work': "your work situation",
-            'relationship': "your relationship situation", 
-            'health': "your health concerns",
-            'school': "your academic situation",
-            'financial': "your financial concerns",
-            'personal': "what you're going through personally",
-            'life_events': "this important event in your life",
-            'loss_grief': "the loss you're experiencing"
-        }
-        
-        base_description = context_descriptions.get(main_context, "what you're going through")
+        base_description = self.general_context_descriptions.get(main_context, "what you're going through")
         
         # Añadir especificidad si hay elementos clave prominentes
         if key_elements:
@@ -543,15 +869,37 @@ class EmpatheticResponseGenerator:
             - Palabras de intensidad media (peso: 1)
             - Letras repetidas (peso: 2)
         """
-        text_lower = text.lower()
+        return self._calculate_emotional_intensity(text, text.lower())
+
+    def _calculate_emotional_intensity(self, text: str, text_lower: str) -> str:
+        """
+        Implementación de calculate_emotional_intensity con el texto ya en minúsculas.
+        """
+        cached = self._intensity_cache.get(text)
+        if cached is not None:
+            return cached
+
         exclamation_count = text.count('!')
         question_count = text.count('?')
-        caps_words = len([word for word in text.split() if word.isupper() and len(word) > 1])
-        high_score = sum(1 for word in self.intensity_words['high'] if word in text_lower)
-        medium_score = sum(1 for word in self.intensity_words['medium'] if word in text_lower)
-        repeated_letters = len(re.findall(r'(.)\1{2,}', text_lower))
+        # Tokenizar una sola vez; el conteo de palabras en mayúsculas y el
+        # pase a minúsculas se hacen en el mismo recorrido de los tokens
+        caps_words = 0
+        lowered_words = []
+        for word in text.split():
+            if len(word) > 1 and word.isupper():
+                caps_words += 1
+            lowered_words.append(word.lower())
+        token_counts = Counter(lowered_words)
+        high_score = sum(token_counts[word] for word in self._high_intensity_set if word in token_counts)
+        medium_score = sum(token_counts[word] for word in self._medium_intensity_set if word in token_counts)
+        # Contar coincidencias sin materializar la lista de grupos capturados
+        repeated_letters = sum(1 for _ in self._repeat_re.finditer(text_lower))
         total = exclamation_count * 2 + question_count + caps_words + high_score * 3 + medium_score + repeated_letters * 2
-        return 'high_intensity' if total > 4 else 'medium_intensity' if total > 1 else 'low_intensity'
+        intensity = 'high_intensity' if total > 4 else 'medium_intensity' if total > 1 else 'low_intensity'
+        if len(self._intensity_cache) >= _ANALYSIS_CACHE_MAXSIZE:
+            self._intensity_cache.clear()
+        self._intensity_cache[text] = intensity
+        return intensity
     
     def convert_to_second_person(self, text: str) -> str:
         """
@@ -572,62 +920,28 @@ class EmpatheticResponseGenerator:
             - "my" → "your"
             - "me" → "you"
             - Y muchas otras formas verbales y pronominales
-            
+
         Características:
-            - Preserva la capitalización original
-            - Usa expresiones regulares para coincidencias exactas
+            - Preserva la capitalización original de cada coincidencia
+              (mayúsculas completas, inicial mayúscula o minúsculas)
+            - Usa un único regex precompilado con todas las alternativas,
+              por lo que el texto se recorre una sola vez
             - Maneja contracciones y formas verbales complejas
         """
-        # Diccionario de conversiones
-        conversions = {
-            r'\bI am\b': 'you are',
-            r'\bI\'m\b': 'you\'re',
-            r'\bI was\b': 'you were',
-            r'\bI have\b': 'you have',
-            r'\bI\'ve\b': 'you\'ve',
-            r'\bI had\b': 'you had',
-            r'\bI\'d\b': 'you\'d',
-            r'\bI will\b': 'you will',
-            r'\bI\'ll\b': 'you\'ll',
-            r'\bI can\b': 'you can',
-            r'\bI can\'t\b': 'you can\'t',
-            r'\bI cannot\b': 'you cannot',
-            r'\bI do\b': 'you do',
-            r'\bI don\'t\b': 'you don\'t',
-            r'\bI did\b': 'you did',
-            r'\bI didn\'t\b': 'you didn\'t',
-            r'\bI feel\b': 'you feel',
-            r'\bI think\b': 'you think',
-            r'\bI know\b': 'you know',
-            r'\bI want\b': 'you want',
-            r'\bI need\b': 'you need',
-            r'\bI like\b': 'you like',
-            r'\bI love\b': 'you love',
-            r'\bI hate\b': 'you hate',
-            r'\bI get\b': 'you get',
-            r'\bI got\b': 'you got',
-            r'\bI went\b': 'you went',
-            r'\bI go\b': 'you go',
-            r'\bI see\b': 'you see',
-            r'\bI saw\b': 'you saw',
-            r'\bI hear\b': 'you hear',
-            r'\bI heard\b': 'you heard',
-            r'\bI\b': 'you',
-            r'\bme\b': 'you',
-            r'\bmy\b': 'your',
-            r'\bmine\b': 'yours',
-            r'\bmyself\b': 'yourself'
-        }
-        
-        result = text
-        for pattern, replacement in conversions.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        # Ajustar la capitalización si es necesario
-        if result and result[0].islower() and text[0].isupper():
-            result = result[0].upper() + result[1:]
-            
-        return result
+        return self._person_pattern.sub(self._convert_person_match, text)
+
+    def _convert_person_match(self, match: 're.Match') -> str:
+        """
+        Resuelve el reemplazo de una coincidencia de primera persona
+        reflejando la capitalización del texto original.
+        """
+        src = match.group(0)
+        repl = self._person_conversions[src.lower()]
+        if len(src) > 1 and src.isupper():
+            return repl.upper()
+        if src[0].isupper():
+            return repl[0].upper() + repl[1:]
+        return repl
     
     def generate_empathetic_response(self, text: str, emotion: str) -> str:
         """
@@ -659,39 +973,41 @@ class EmpatheticResponseGenerator:
             - Adaptación según intensidad emocional
             - Manejo robusto de emociones complejas
         """
+        # Convertir a minúsculas una sola vez para todos los análisis
+        text_lower = text.lower()
+
         # Paso 1: Análisis contextual profundo
-        context_info = self.identify_context(text)
-        
+        context_info = self._identify_context(text, text_lower)
+
         # Paso 2: Normalización inteligente de emociones
         emotion = emotion.lower()
         if emotion not in self.empathetic_patterns:
             emotion_category = self.emotion_mapping.get(emotion, 'neutral')
-            
+
             # Mapeo más inteligente basado en contexto y contenido
             if emotion_category == 'positive':
-                if any(word in text.lower() for word in ['excited', 'thrilled', 'amazing', 'fantastic']):
+                if any(word in text_lower for word in ['excited', 'thrilled', 'amazing', 'fantastic']):
                     emotion = 'joy'
-                elif context_info['main_context'] == 'work' and any(word in text.lower() for word in ['promotion', 'success', 'achieved']):
+                elif context_info['main_context'] == 'work' and any(word in text_lower for word in ['promotion', 'success', 'achieved']):
                     emotion = 'joy'
                 else:
                     emotion = 'joy'
-                    
+
             elif emotion_category == 'negative':
-                # Mapeo contextual más preciso
-                text_lower = text.lower()
-                
-                if context_info['sub_context'] == 'work_stress' or any(word in text_lower for word in ['frustrated', 'angry', 'mad', 'infuriated']):
+                # Mapeo contextual más preciso: una sola pasada por la
+                # tabla plana encuentra la palabra clave de mayor prioridad
+                matched_emotion = None
+                for keyword, mapped_emotion in self._negative_fallback_keywords:
+                    if keyword in text_lower:
+                        matched_emotion = mapped_emotion
+                        break
+
+                if context_info['sub_context'] == 'work_stress' or matched_emotion == 'anger':
                     emotion = 'anger'
-                elif context_info['sub_context'] in ['relationship_loss', 'loss_grief'] or any(word in text_lower for word in ['sad', 'depressed', 'heartbroken', 'devastated']):
+                elif context_info['sub_context'] in ['relationship_loss', 'loss_grief'] or matched_emotion == 'sadness':
                     emotion = 'sadness'
-                elif any(word in text_lower for word in ['scared', 'afraid', 'worried', 'anxious', 'nervous']):
-                    emotion = 'fear'
-                elif any(word in text_lower for word in ['disappointed', 'let down', 'expected', 'hoped']):
-                    emotion = 'disappointment'
-                elif any(word in text_lower for word in ['embarrassed', 'ashamed', 'humiliated', 'mortified']):
-                    emotion = 'embarrassment'
-                elif any(word in text_lower for word in ['disgusted', 'repulsed', 'sick', 'revolting']):
-                    emotion = 'disgust'
+                elif matched_emotion is not None:
+                    emotion = matched_emotion
                 else:
                     # Default basado en contexto
                     if context_info['main_context'] in ['work', 'school']:
@@ -702,55 +1018,49 @@ class EmpatheticResponseGenerator:
                 emotion = 'neutral'
         
         # Paso 3: Generación de contexto natural y específico
-        context_summary = self.generate_context_summary(text)
+        context_summary = self._generate_context_summary(text, text_lower)
         
         # Paso 4: Selección de patrón contextualizado
-        available_patterns = self.empathetic_patterns.get(emotion, self.empathetic_patterns['neutral'])
-        
+        available_patterns = self._pattern_parts.get(emotion, self._pattern_parts['neutral'])
+
         # Seleccionar patrón más apropiado basado en contexto e intensidad
-        intensity = self.calculate_emotional_intensity(text)
-        
+        intensity = self._calculate_emotional_intensity(text, text_lower)
+
         # Filtrar patrones según intensidad cuando sea apropiado
-        if intensity == 'high_intensity':
+        if intensity == 'high_intensity' and emotion in self._strong_pattern_parts:
             # Para alta intensidad, preferir patrones más fuertes
-            preferred_patterns = [p for p in available_patterns if any(word in p.lower() for word in 
-                                ['really', 'completely', 'absolutely', 'deeply', 'truly', 'so', 'incredibly'])]
-            if preferred_patterns:
-                available_patterns = preferred_patterns
-        
-        selected_pattern = random.choice(available_patterns)
-        
-        # Paso 5: Formatear respuesta con contexto
-        main_response = selected_pattern.format(context=context_summary)
-        
+            available_patterns = self._strong_pattern_parts[emotion]
+
+        prefix, suffix = available_patterns[self._rng.randrange(len(available_patterns))]
+
+        # Paso 5: Armar respuesta con contexto por concatenación directa
+        main_response = prefix + context_summary + suffix
+
         # Paso 6: Seleccionar seguimiento apropiado
         follow_up_options = self.follow_up_phrases[intensity]
-        
+
         # Personalizar seguimiento basado en contexto cuando sea relevante
         if context_info['main_context'] == 'work' and intensity == 'high_intensity':
-            work_specific_followups = [
+            follow_up_options = follow_up_options + (
                 "How are you managing the stress at work?",
-                "What support do you have in your workplace?", 
+                "What support do you have in your workplace?",
                 "Have you been able to talk to anyone about this situation?"
-            ]
-            follow_up_options.extend(work_specific_followups)
+            )
         elif context_info['main_context'] == 'relationship' and emotion in ['sadness', 'anger']:
-            relationship_followups = [
+            follow_up_options = follow_up_options + (
                 "Do you have support from friends or family right now?",
                 "How are you taking care of yourself through this?",
                 "What has been helping you process these feelings?"
-            ]
-            follow_up_options.extend(relationship_followups)
-        
-        follow_up = random.choice(follow_up_options)
-        
+            )
+
+        follow_up = follow_up_options[self._rng.randrange(len(follow_up_options))]
+
         # Paso 7: Combinar respuesta final con transición natural
         if intensity == 'high_intensity':
             return f"{main_response} {follow_up}"
         else:
             # Para intensidades menores, usar transiciones más suaves
-            transitions = ["", "I'm curious, ", "I wonder, ", "If you don't mind me asking, "]
-            transition = random.choice(transitions)
+            transition = self._soft_transitions[self._rng.randrange(len(self._soft_transitions))]
             return f"{main_response} {transition}{follow_up.lower()}"
     
     def analyze_emotional_context_depth(self, text: str, emotion: str, context_info: Dict[str, any]) -> Dict[str, any]:
@@ -29,8 +29,13 @@ Funcionalidades principales:
 import tkinter as tk
 import customtkinter as ctk
 import threading
+import collections
+import concurrent.futures
+import functools
+import json
+import os
+import queue
 import time
-import datetime
 
 # Importaciones lazy - se cargarán solo cuando se necesiten
 # from PIL import Image, ImageTk
@@ -54,22 +59,90 @@ Image = None
 ImageTk = None
 EmpatheticResponseGenerator = None
 
+# Lock para que la precarga en segundo plano y la carga lazy bajo demanda
+# no construyan el mismo modelo dos veces
+_model_load_lock = threading.Lock()
+
 def load_ai_models():
     """
     Carga los modelos de IA de forma lazy cuando se necesiten.
     """
     global emotion_classifier
-    if emotion_classifier is None:
-        from transformers import pipeline
-        # Inicializar clasificador de emociones usando modelo preentrenado
-        # Utiliza DistilRoBERTa optimizado para clasificación de emociones en inglés
-        emotion_classifier = pipeline(
-            "text-classification", 
-            model="j-hartmann/emotion-english-distilroberta-base", 
-            return_all_scores=False
-        )
+    with _model_load_lock:
+        if emotion_classifier is None:
+            from transformers import pipeline
+            # Inicializar clasificador de emociones usando modelo preentrenado
+            # Utiliza DistilRoBERTa optimizado para clasificación de emociones en inglés
+            emotion_classifier = pipeline(
+                "text-classification",
+                model="j-hartmann/emotion-english-distilroberta-base",
+                return_all_scores=False
+            )
+            # Cuantización dinámica int8 de las capas lineales: 2-4x menos
+            # latencia de inferencia en CPU y ~4x menos memoria del modelo.
+            # Si la plataforma no la soporta se continúa con el modelo FP32
+            try:
+                import torch
+                emotion_classifier.model = torch.quantization.quantize_dynamic(
+                    emotion_classifier.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            except Exception as e:
+                print(f"Cuantización no disponible, se usa FP32: {e}")
     return emotion_classifier
 
+# Caché del timestamp de chat: el formato [HH:MM] solo cambia una vez por
+# minuto, así que strftime se ejecuta a lo sumo una vez por minuto
+_ts_cache = [0, '']
+
+def _current_timestamp():
+    """
+    Devuelve el timestamp [HH:MM] actual, regenerándolo solo al cambiar de minuto.
+    """
+    minute = int(time.time()) // 60
+    if minute != _ts_cache[0]:
+        _ts_cache[0] = minute
+        _ts_cache[1] = time.strftime("[%H:%M]")
+    return _ts_cache[1]
+
+def _classification_key(text):
+    """
+    Normaliza un texto como clave de la caché de clasificación.
+
+    Colapsa espacios y mayúsculas y recorta a 256 caracteres: variantes
+    triviales del mismo enunciado comparten entrada de caché y las claves
+    no retienen transcripciones arbitrariamente largas.
+    """
+    return " ".join(text.lower().split())[:256]
+
+# Teclas que no editan el chat y deben llegar al widget: navegación con
+# el teclado y los propios modificadores
+_CHAT_NAV_KEYS = frozenset({
+    'Up', 'Down', 'Left', 'Right', 'Prior', 'Next', 'Home', 'End',
+    'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R'
+})
+
+def _is_trivial_text(text):
+    """
+    Detecta textos sin contenido clasificable (muy cortos o sin letras).
+
+    Para estos casos el clasificador no aporta información y se responde
+    como neutral sin pagar el forward pass del modelo.
+    """
+    stripped = text.strip()
+    return len(stripped) < 3 or not any(c.isalpha() for c in stripped)
+
+@functools.lru_cache(maxsize=1024)
+def classify_emotion(text):
+    """
+    Clasifica la emoción de un texto normalizado, con caché LRU.
+
+    Los textos repetidos (frases re-dictadas o re-escritas por el usuario)
+    resuelven en un lookup O(1) en lugar de repetir el forward pass del
+    transformer (decenas a cientos de ms en CPU).
+    """
+    classifier = load_ai_models()
+    return classifier(text)[0]['label']
+
 def load_cv2():
     """
     Carga OpenCV de forma lazy cuando se necesite.
@@ -161,13 +234,18 @@ class EmotionalDiaryApp:
         self.window.title("Diario Emocional")
         self.window.geometry("1000x800")
         
-        # Configurar protocolo de cierre
-        if self.return_to_menu:
-            self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Configurar protocolo de cierre: siempre pasa por on_closing para
+        # soltar cámara, log y callbacks pendientes aunque no haya menú
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         # Inicializar componentes de reconocimiento de voz (lazy loading)
         self.recognizer = None
         self.is_recording = False
+        self._offline_recognition = False
+        # Micrófono persistente: abrir PortAudio cuesta 100-300ms, así
+        # que el stream se abre en la primera grabación y se reutiliza
+        self._mic = None
+        self._mic_source = None
         
         # Inicializar generador de respuestas empáticas (lazy loading)
         self.empathetic_generator = None
@@ -175,10 +253,75 @@ class EmotionalDiaryApp:
         # Configurar captura de cámara (lazy loading)
         self.camera_on = True
         self.cap = None
+        self._cv2 = None
+
+        # PhotoImage persistente para el video: se crea con el primer
+        # frame y se reutiliza con paste() en lugar de asignar uno nuevo
+        # cada 30ms (evita churn de ~700KB por frame y presión de GC)
+        self._photo = None
+
+        # Identificador del after() de la cámara, para cancelarlo al cerrar
+        self._after_id = None
+
+        # Cadencia de redibujado derivada del FPS real de la cámara
+        # (init_camera la ajusta); contadores para saltar el redibujado
+        # cuando el hilo de captura no produjo un frame nuevo. El hilo
+        # productor deja el último frame decodificado en _latest_frame y
+        # el tick de Tk solo lo lee (el intercambio de referencia es
+        # atómico en CPython)
+        self._camera_interval_ms = 30
+        self._frame_seq = 0
+        self._shown_seq = 0
+        self._latest_frame = None
+
+        # Lock para inicializar el generador empático una sola vez
+        self._empathy_init_lock = threading.Lock()
+
+        # Cola de mensajes entre los hilos de fondo y el hilo de la UI
+        # Los hilos de grabación/análisis no tocan widgets directamente:
+        # publican aquí y check_message_queue los vuelca al chat en lotes.
+        # Un deque basta para este patrón productores->un consumidor:
+        # append y popleft son atómicos en CPython, sin locks por mensaje
+        self.message_queue = collections.deque()
+
+        # Pool de hilos para la clasificación de emociones: el forward
+        # pass del transformer nunca corre en el hilo de la UI, así la
+        # cámara y el chat siguen fluidos mientras el modelo trabaja
+        self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+        # Ejecutor de un solo hilo para la grabación: garantiza que nunca
+        # haya dos bucles de grabación vivos aunque el usuario alterne el
+        # botón rápidamente, y evita crear un hilo nuevo por toggle
+        self._rec_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        # Textos pendientes de clasificar: las ráfagas de transcripciones
+        # cortas se agrupan (debounce de 100ms) en un solo forward pass
+        # por lotes en lugar de una pasada del modelo por frase
+        self._pending_texts = collections.deque()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+
+        # Cola y hilo escritor del log: la UI solo encola entradas; un
+        # hilo de fondo mantiene el archivo abierto, escribe en lotes y
+        # hace flush cuando la cola queda vacía. Un None encolado le
+        # indica que vacíe y cierre el archivo
+        os.makedirs("./logs", exist_ok=True)
+        self._log_q = queue.Queue()
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
 
         # Construir interfaz de usuario
         self.build_ui()
-        
+
+        # El drenado de la cola se dispara por evento virtual en lugar de
+        # un sondeo periódico: sin mensajes pendientes no hay despertares
+        self.window.bind('<<ChatMessage>>', lambda event: self.check_message_queue())
+
+        # Precargar los modelos de IA en segundo plano una vez construida
+        # la interfaz: la ventana aparece de inmediato y la primera
+        # respuesta no paga la carga de los modelos
+        threading.Thread(target=self.preload_ai_models, daemon=True).start()
+
         # Iniciar actualización de cámara solo si se activa
         if self.camera_on:
             self.init_camera()
@@ -187,26 +330,110 @@ class EmotionalDiaryApp:
     def init_camera(self):
         """
         Inicializa la cámara de forma lazy cuando se necesite.
+
+        Además del capturador, arranca un hilo que llama a grab()
+        continuamente: la cámara entrega frames a su FPS nativo pero solo
+        se decodifican (retrieve) los que la interfaz llega a mostrar.
         """
         if self.cap is None:
-            cv2_module = load_cv2()
+            # Referencia al módulo ligada una sola vez: los bucles
+            # calientes usan self._cv2 en vez de pasar por load_cv2()
+            self._cv2 = cv2_module = load_cv2()
             self.cap = cv2_module.VideoCapture(0)
+            # Buffer de 1 frame: retrieve() entrega siempre el frame más
+            # reciente en lugar de uno atrasado del buffer del driver
+            self.cap.set(cv2_module.CAP_PROP_BUFFERSIZE, 1)
+            # Pedir al driver frames MJPG ya al tamaño de la interfaz para
+            # evitar el resize por frame en Python (si el driver lo ignora,
+            # update_camera redimensiona como respaldo)
+            self.cap.set(cv2_module.CAP_PROP_FOURCC,
+                         cv2_module.VideoWriter_fourcc(*'MJPG'))
+            self.cap.set(cv2_module.CAP_PROP_FRAME_WIDTH, 640)
+            self.cap.set(cv2_module.CAP_PROP_FRAME_HEIGHT, 360)
+            # Ajustar la cadencia de redibujado al FPS nativo: no tiene
+            # sentido redibujar a 33 FPS si la cámara entrega 15
+            fps = self.cap.get(cv2_module.CAP_PROP_FPS)
+            if not fps or fps <= 0:
+                fps = 30
+            self._camera_interval_ms = max(15, int(1000 / fps))
+            self._cap_lock = threading.Lock()
+            threading.Thread(target=self._grab_loop, daemon=True).start()
+
+    def _grab_loop(self):
+        """
+        Hilo productor: captura, decodifica y escala fuera del hilo de la UI.
+
+        grab() avanza la cámara sin decodificar; retrieve() (YUV->BGR) y el
+        resize solo se ejecutan cuando la interfaz ya consumió el frame
+        anterior, de modo que se decodifica como máximo a la cadencia de
+        redibujado y el tick de Tk queda reducido a leer _latest_frame.
+        """
+        cv2_module = self._cv2
+        while self.camera_on and self.cap is not None:
+            try:
+                with self._cap_lock:
+                    grabbed = self.cap.grab()
+                    # Decodificar solo si la UI ya mostró el frame previo
+                    if grabbed and self._frame_seq == self._shown_seq:
+                        ok, frame = self.cap.retrieve()
+                    else:
+                        ok = False
+            except Exception:
+                # La cámara fue liberada durante el cierre
+                break
+            if ok:
+                # Redimensionar solo si el driver no entregó 640x360;
+                # INTER_AREA es el filtro óptimo (y más barato) al reducir
+                if frame.shape[1] != 640 or frame.shape[0] != 360:
+                    frame = cv2_module.resize(frame, (640, 360),
+                                              interpolation=cv2_module.INTER_AREA)
+                self._latest_frame = frame
+                self._frame_seq += 1
     
     def init_speech_recognition(self):
         """
         Inicializa el reconocimiento de voz de forma lazy cuando se necesite.
+
+        Si Vosk está instalado se prefiere el reconocimiento offline: cada
+        frase se transcribe localmente sin el viaje de red a Google
+        (cientos de ms por frase). Sin Vosk se usa Google como siempre.
         """
         if self.recognizer is None:
             sr_module = load_speech_recognition()
             self.recognizer = sr_module.Recognizer()
+            try:
+                import vosk  # noqa: F401
+                self._offline_recognition = True
+            except ImportError:
+                self._offline_recognition = False
     
     def init_empathy_generator(self):
         """
         Inicializa el generador empático de forma lazy cuando se necesite.
         """
         if self.empathetic_generator is None:
-            EmpGen = load_empathy()
-            self.empathetic_generator = EmpGen()
+            with self._empathy_init_lock:
+                if self.empathetic_generator is None:
+                    EmpGen = load_empathy()
+                    self.empathetic_generator = EmpGen()
+
+    def preload_ai_models(self):
+        """
+        Precarga el clasificador de emociones y el generador empático.
+
+        Se ejecuta en un hilo en segundo plano al iniciar la aplicación;
+        si algo falla, los modelos se siguen cargando de forma lazy en la
+        primera respuesta como hasta ahora.
+        """
+        try:
+            load_ai_models()
+            self.init_empathy_generator()
+            # Inferencia de calentamiento: el primer forward pass paga
+            # inicializaciones de kernels y allocador que así no recaen
+            # sobre el primer mensaje real del usuario
+            classify_emotion("hola")
+        except Exception as e:
+            print(f"Precarga de modelos fallida (se cargarán bajo demanda): {e}")
 
     def build_ui(self):
         """
@@ -262,9 +489,15 @@ class EmotionalDiaryApp:
         self.chat_display = ctk.CTkTextbox(self.main_frame, height=300, wrap="word")
         self.chat_display.pack(padx=10, pady=10, fill="both", expand=False)
         self.chat_display.insert("1.0", "[Diario iniciado]\n")
-        self.chat_display.configure(state="disabled")
+        # Bloquear la edición del usuario interceptando el teclado en vez
+        # de alternar state normal/disabled en cada mensaje (dos llamadas
+        # Tcl menos por línea insertada desde append_chat); copiar y
+        # desplazarse con el teclado siguen funcionando
+        self.chat_display.bind("<Key>", self._on_chat_key)
 
         # Campo de entrada de texto con placeholder y binding de Enter
+        # Sin textvariable: CTkEntry desactiva el placeholder cuando se
+        # vincula un StringVar, así que se lee y limpia con get()/delete()
         self.input_box = ctk.CTkEntry(self.main_frame, placeholder_text="Escribe tu mensaje aquí...", width=800)
         self.input_box.pack(padx=10, pady=(0,10))
         self.input_box.bind("<Return>", lambda event: self.process_text_input())
@@ -288,8 +521,9 @@ class EmotionalDiaryApp:
             # Iniciar grabación
             self.is_recording = True
             self.record_button.configure(text="⏹️ Detener")
-            # Ejecutar grabación en hilo separado para no bloquear UI
-            threading.Thread(target=self.record_audio).start()
+            # Ejecutar grabación en el ejecutor dedicado: un único hilo
+            # reutilizado entre sesiones, sin hilos huérfanos por toggles
+            self._rec_pool.submit(self.record_audio)
         else:
             # Detener grabación
             self.is_recording = False
@@ -316,20 +550,50 @@ class EmotionalDiaryApp:
         - Timeout: 1 segundo para evitar bloqueos largos
         """
         sr_module = load_speech_recognition()
-        with sr_module.Microphone() as source:
-            while self.is_recording:
-                try:
-                    # Escuchar audio con timeout corto para responsividad
-                    audio = self.recognizer.listen(source, timeout=1)
-                    # Reconocer texto en español
+        # Abrir el micrófono solo la primera vez: el stream de PortAudio
+        # persiste entre sesiones de grabación y se cierra al salir de la
+        # aplicación, evitando el costo de apertura en cada toggle
+        if self._mic_source is None:
+            self._mic = sr_module.Microphone()
+            self._mic_source = self._mic.__enter__()
+            # Calibrar el umbral de ruido una sola vez con el stream nuevo
+            self.recognizer.adjust_for_ambient_noise(self._mic_source, duration=0.5)
+        source = self._mic_source
+        while self.is_recording:
+            try:
+                # Escuchar audio con timeout corto para responsividad
+                # y límite de frase para que listen() retorne pronto
+                audio = self.recognizer.listen(source, timeout=1,
+                                               phrase_time_limit=10)
+                # Reconocer texto en español: offline con Vosk si está
+                # disponible (sin RTT de red), Google como respaldo
+                if self._offline_recognition:
+                    try:
+                        result = self.recognizer.recognize_vosk(audio, language="es")
+                        text = json.loads(result).get("text", "")
+                    except Exception:
+                        text = self.recognizer.recognize_google(audio, language="es-ES")
+                else:
                     text = self.recognizer.recognize_google(audio, language="es-ES")
-                    # Mostrar texto reconocido en chat
-                    self.append_chat("Tú", text)
-                    # Generar respuesta empática automática
-                    self.generate_response(text)
-                except:
-                    # Continuar grabación ignorando errores temporales
+                if not text:
                     continue
+                # Publicar texto reconocido para el hilo de la UI
+                self.post_chat("Tú", text)
+                # Generar respuesta empática automática
+                self.generate_response(text)
+            except (sr_module.WaitTimeoutError, sr_module.UnknownValueError):
+                # Silencio o audio ininteligible: seguir escuchando
+                continue
+            except sr_module.RequestError as e:
+                # Fallo del servicio de reconocimiento: registrar y seguir
+                print(f"Error del servicio de reconocimiento: {e}")
+                continue
+            except Exception as e:
+                # Error inesperado (p. ej. micrófono desconectado):
+                # registrarlo y terminar la sesión en vez de ocultarlo
+                print(f"Grabación interrumpida: {e}")
+                self.is_recording = False
+                break
 
     def process_text_input(self):
         """
@@ -368,25 +632,120 @@ class EmotionalDiaryApp:
         - Captura excepciones durante el análisis o generación
         - Muestra mensaje de error informativo en caso de fallo
         - Continúa funcionando aunque falle una respuesta específica
-        
+
         Datos mostrados:
         - Respuesta empática generada
         - Emoción detectada (para logging y análisis)
+
+        El análisis corre en el pool de hilos (self._exec) para no
+        bloquear al llamador: desde la UI el envío retorna de inmediato y
+        la respuesta llega luego por la cola de mensajes. Los textos que
+        llegan en ráfaga se clasifican juntos en un solo lote.
+        """
+        with self._pending_lock:
+            self._pending_texts.append(text)
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._exec.submit(self._flush_pending)
+
+    def _flush_pending(self):
+        """
+        Clasifica los textos acumulados y publica sus respuestas (hilo del pool).
+
+        Espera 100ms antes de drenar para que las transcripciones que
+        llegan casi juntas compartan un único forward pass por lotes.
         """
+        time.sleep(0.1)
+        with self._pending_lock:
+            texts = list(self._pending_texts)
+            self._pending_texts.clear()
+            self._flush_scheduled = False
+        if not texts:
+            return
+
         try:
-            # Cargar modelos de IA si no están cargados
-            classifier = load_ai_models()
+            # Textos triviales (vacíos, sin letras, de una o dos letras)
+            # se responden como neutrales sin pasar por el clasificador
+            emotions = ['neutral' if _is_trivial_text(t) else None for t in texts]
+            to_classify = [i for i, e in enumerate(emotions) if e is None]
+
+            # Avisar si la precarga en segundo plano aún no terminó: la
+            # respuesta llegará apenas el modelo esté listo
+            if to_classify and emotion_classifier is None:
+                self.post_chat("Bot", "Cargando modelos de IA, un momento...")
+
+            # Cargar generador empático si no está cargado
             self.init_empathy_generator()
-            
-            # Clasificar emoción usando modelo DistilRoBERTa
-            emotion = classifier(text)[0]['label']
-            # Generar respuesta empática personalizada
-            response = self.empathetic_generator.generate_empathetic_response(text, emotion)
-            # Mostrar respuesta del bot con emoción detectada
-            self.append_chat("Bot", response, emotion)
+
+            # Clasificar emociones con modelo DistilRoBERTa; la entrada
+            # normalizada hace que los textos repetidos acierten en la caché
+            if len(to_classify) == 1:
+                i = to_classify[0]
+                emotions[i] = classify_emotion(_classification_key(texts[i]))
+            elif to_classify:
+                # Varias frases pendientes: forward pass por lotes de
+                # hasta 8; ordenar por longitud agrupa secuencias
+                # parecidas en el mismo lote y minimiza el padding
+                classifier = load_ai_models()
+                normalized = [_classification_key(texts[i]) for i in to_classify]
+                order = sorted(range(len(normalized)),
+                               key=lambda i: len(normalized[i]))
+                results = classifier([normalized[i] for i in order],
+                                     batch_size=min(len(order), 8))
+                for pos, j in enumerate(order):
+                    emotions[to_classify[j]] = results[pos]['label']
+
+            for text, emotion in zip(texts, emotions):
+                # Generar respuesta empática personalizada
+                response = self.empathetic_generator.generate_empathetic_response(text, emotion)
+                # Publicar respuesta del bot con emoción detectada
+                self.post_chat("Bot", response, emotion)
         except Exception as e:
-            # Mostrar error en caso de fallo en el procesamiento
-            self.append_chat("Bot", f"Error generando respuesta empática: {e}")
+            # Publicar error en caso de fallo en el procesamiento
+            self.post_chat("Bot", f"Error generando respuesta empática: {e}")
+
+    def post_chat(self, speaker, message, emotion="Input"):
+        """
+        Publica un mensaje en la cola para que el hilo de la UI lo muestre.
+
+        Puede llamarse con seguridad desde cualquier hilo; los widgets de
+        Tkinter solo se tocan desde check_message_queue, que se despierta
+        mediante el evento virtual <<ChatMessage>> (event_generate es
+        seguro entre hilos en Tk).
+        """
+        self.message_queue.append((speaker, message, emotion))
+        try:
+            self.window.event_generate('<<ChatMessage>>', when='tail')
+        except tk.TclError:
+            # La ventana ya fue destruida; el mensaje queda en la cola
+            pass
+
+    def check_message_queue(self):
+        """
+        Drena la cola de mensajes y los añade al chat en un solo lote.
+
+        Se ejecuta al recibir el evento <<ChatMessage>>; la cola se vacía
+        completa antes de retornar, de modo que una ráfaga de mensajes
+        produce un único redibujado y los eventos sobrantes de la ráfaga
+        encuentran la cola vacía sin coste.
+        """
+        while self.message_queue:
+            speaker, message, emotion = self.message_queue.popleft()
+            self.append_chat(speaker, message, emotion)
+
+    def _on_chat_key(self, event):
+        """
+        Filtra el teclado del chat: bloquea solo las teclas que editarían.
+
+        Los atajos con Control (copiar, seleccionar todo) y las teclas de
+        navegación o modificadores no alteran el contenido y pasan al
+        widget; el resto se corta con "break".
+        """
+        if event.state & 0x4:  # Control presionado
+            return None
+        if event.keysym in _CHAT_NAV_KEYS:
+            return None
+        return "break"
 
     def append_chat(self, speaker, message, emotion="Input"):
         """
@@ -410,14 +769,11 @@ class EmotionalDiaryApp:
         - Archivos guardados en ./logs/diario_emocional_log.txt
         """
         # Generar timestamp para el mensaje
-        timestamp = datetime.datetime.now().strftime("[%H:%M]")
+        timestamp = _current_timestamp()
         
-        # Habilitar edición temporal del área de chat
-        self.chat_display.configure(state="normal")
-        # Insertar nuevo mensaje al final
+        # Insertar nuevo mensaje al final; el textbox queda siempre
+        # escribible desde Python y el binding de <Key> bloquea al usuario
         self.chat_display.insert(tk.END, f"{timestamp} {speaker}: {message}\n")
-        # Deshabilitar edición para prevenir modificaciones del usuario
-        self.chat_display.configure(state="disabled")
         # Scroll automático al último mensaje
         self.chat_display.see(tk.END)
         
@@ -446,57 +802,90 @@ class EmotionalDiaryApp:
         - Cada línea representa una interacción
         - Incluye timestamps, speakers y contenido
         - Las respuestas del bot incluyen emoción detectada
+
+        La entrada solo se encola: el hilo escritor (_log_worker) es quien
+        toca el disco, así que la UI nunca bloquea en E/S.
+        """
+        self._log_q.put(entry)
+
+    def _log_worker(self):
+        """
+        Hilo escritor del log: mantiene el archivo abierto y escribe en lotes.
+
+        Bloquea en la cola sin despertares ociosos; tras cada escritura
+        hace flush solo si no quedan entradas pendientes, de modo que una
+        ráfaga de mensajes se vuelca al disco en un único flush. Un None
+        en la cola indica que debe terminar y cerrar el archivo.
         """
-        # Escribir entrada al archivo de log con codificación UTF-8
-        with open("./logs/diario_emocional_log.txt", "a", encoding="utf-8") as f:
-            f.write(entry)
+        with open("./logs/diario_emocional_log.txt", "a",
+                  encoding="utf-8", buffering=8192) as f:
+            while True:
+                entry = self._log_q.get()
+                if entry is None:
+                    break
+                f.write(entry)
+                if self._log_q.empty():
+                    f.flush()
 
     def update_camera(self):
         """
         Actualiza la visualización de la cámara en tiempo real.
         
         Proceso de actualización:
-        1. Verifica que la cámara esté habilitada
-        2. Captura frame actual de la cámara
-        3. Redimensiona frame a 640x360 para interfaz
-        4. Convierte color de BGR (OpenCV) a RGB (PIL)
-        5. Convierte a formato compatible con Tkinter
-        6. Actualiza el label de la cámara
-        7. Programa siguiente actualización después de 30ms
-        
+        1. Verifica que la cámara esté habilitada y haya frame nuevo
+        2. Toma el último frame ya decodificado por el hilo productor
+        3. Codifica el frame a PPM y lo carga directo en el PhotoImage
+        4. Programa la siguiente actualización a la cadencia de la cámara
+
         Características:
-        - Actualización a ~33 FPS (cada 30ms)
+        - Cadencia derivada del FPS real de la cámara
         - Redimensionamiento automático para UI
-        - Conversión de formato de color automática
+        - Conversión de formato de color automática (imencode)
         - Bucle continuo mientras la aplicación esté activa
         
         Manejo de errores:
         - Si no hay frame disponible, mantiene imagen anterior
         - Continúa el bucle de actualización independientemente
         """
-        if self.camera_on and self.cap is not None:
-            # Cargar módulos necesarios
-            cv2_module = load_cv2()
-            Image_module, ImageTk_module = load_pil()
-            
-            # Capturar frame de la cámara
-            ret, frame = self.cap.read()
-            if ret:
-                # Redimensionar frame para interfaz (640x360)
-                frame = cv2_module.resize(frame, (640, 360))
-                # Convertir de BGR (OpenCV) a RGB (PIL/Tkinter)
-                frame = cv2_module.cvtColor(frame, cv2_module.COLOR_BGR2RGB)
-                # Convertir a formato PIL
-                img = Image_module.fromarray(frame)
-                # Convertir a formato Tkinter
-                imgtk = ImageTk_module.PhotoImage(image=img)
-                # Actualizar label de cámara
-                self.camera_label.configure(image=imgtk, text="")
-                # Mantener referencia para evitar garbage collection
-                self.camera_label.imgtk = imgtk
-        
-        # Programar siguiente actualización en 30ms
-        self.window.after(30, self.update_camera)
+        # Ventana minimizada u oculta: nadie ve el video, así que se
+        # sondea lento sin codificar nada hasta que vuelva a mapearse
+        # (el hilo productor deja de decodificar solo, porque la UI no
+        # consume frames mientras tanto)
+        if not self.camera_label.winfo_viewable():
+            self._after_id = self.window.after(250, self.update_camera)
+            return
+
+        if (self.camera_on and self.cap is not None
+                and self._frame_seq != self._shown_seq):
+            cv2_module = self._cv2
+
+            # Tomar el último frame ya decodificado y escalado por el
+            # hilo productor; si no hubo frame nuevo no se redibuja
+            frame = self._latest_frame
+            self._shown_seq = self._frame_seq
+            if frame is not None:
+                # Codificar a PPM (cabecera + pixeles crudos, imencode ya
+                # maneja el orden BGR->RGB) y entregarlo directo a Tk sin
+                # pasar por PIL: una sola conversión por frame
+                ok, buf = cv2_module.imencode('.ppm', frame)
+                if ok:
+                    data = buf.tobytes()
+                    if self._photo is None:
+                        # Primer frame: crear el PhotoImage y enlazarlo al label
+                        self._photo = tk.PhotoImage(data=data)
+                        self.camera_label.configure(image=self._photo, text="")
+                        # Mantener referencia para evitar garbage collection
+                        self.camera_label.imgtk = self._photo
+                    else:
+                        # Frames siguientes: recargar los pixeles sobre el
+                        # PhotoImage existente sin asignar uno nuevo
+                        self._photo.configure(data=data)
+        
+        # Programar siguiente actualización a la cadencia de la cámara;
+        # durante la grabación se baja a ~5 FPS para ceder CPU al
+        # reconocimiento de voz y al clasificador
+        delay = 200 if self.is_recording else self._camera_interval_ms
+        self._after_id = self.window.after(delay, self.update_camera)
 
     def run(self):
         """
@@ -517,43 +906,78 @@ class EmotionalDiaryApp:
         # Iniciar bucle principal de la aplicación
         self.window.mainloop()
         # Limpiar recursos al cerrar la aplicación
+        self.camera_on = False  # Detener el hilo de grab() antes de liberar
         if self.cap is not None:
-            self.cap.release()
+            # release() bajo el lock de la cámara: el hilo productor puede
+            # estar dentro de grab()/retrieve() y VideoCapture no es segura
+            # entre hilos
+            with self._cap_lock:
+                self.cap.release()
         if cv2 is not None:
             cv2.destroyAllWindows()
+        # Liberar el pool de clasificación sin esperar tareas pendientes
+        self._exec.shutdown(wait=False)
+        # Pedir al hilo escritor que vacíe y cierre el log
+        self._log_q.put(None)
+        self._log_thread.join(timeout=2)
     
-    def on_closing(self):
+    def _shutdown_resources(self):
         """
-        Maneja el cierre de la ventana.
+        Libera los recursos compartidos antes de destruir la ventana.
+
+        Detiene la grabación y el hilo de grab(), cancela el after() de la
+        cámara pendiente (evita callbacks sobre widgets destruidos), libera
+        la cámara y cierra el archivo de log. Es idempotente: las rutas de
+        cierre y navegación pueden llamarlo más de una vez sin efecto.
         """
+        self.is_recording = False
+        self._rec_pool.shutdown(wait=False)
+        if self._mic_source is not None:
+            try:
+                self._mic.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._mic_source = None
+        self.camera_on = False  # Detener el hilo de grab() antes de liberar
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
         if self.cap is not None:
-            self.cap.release()
+            # release() bajo el lock de la cámara: el hilo productor puede
+            # estar dentro de grab()/retrieve() y VideoCapture no es segura
+            # entre hilos
+            with self._cap_lock:
+                self.cap.release()
+                self.cap = None
         if cv2 is not None:
             cv2.destroyAllWindows()
+        # Pedir al hilo escritor que vacíe y cierre el log
+        self._log_q.put(None)
+        self._log_thread.join(timeout=2)
+
+    def on_closing(self):
+        """
+        Maneja el cierre de la ventana.
+        """
+        self._shutdown_resources()
         self.window.destroy()
         if self.return_to_menu:
             self.return_to_menu()
-    
+
     def go_to_menu(self):
         """
         Navega al menú principal.
         """
-        if self.cap is not None:
-            self.cap.release()
-        if cv2 is not None:
-            cv2.destroyAllWindows()
+        self._shutdown_resources()
         self.window.destroy()
         if self.return_to_menu:
             self.return_to_menu()
-    
+
     def go_to_viewer(self):
         """
         Navega al visor del historial.
         """
-        if self.cap is not None:
-            self.cap.release()
-        if cv2 is not None:
-            cv2.destroyAllWindows()
+        self._shutdown_resources()
         self.window.destroy()
         if self.return_to_menu:
             from diary_viewer import DiaryViewerApp
@@ -22,47 +22,86 @@ Funcionalidades principales:
 """
 
 import speech_recognition as sr
+import json
 import os
+import time
 from datetime import datetime
 
 # Constantes de Configuración
 CARPETA_AUDIO = "audio_inputs"  # Directorio donde se almacenarán los archivos de audio
 DURACION_SEGUNDOS = 5  # Duración de la grabación en segundos
 
-# Crear directorio de audio si no existe
-# Esto asegura que la ubicación de almacenamiento esté disponible antes de grabar
-os.makedirs(CARPETA_AUDIO, exist_ok=True)
-
-# Generar nombre de archivo basado en timestamp
-# Formato: grabacion_AAAA-MM-DD_HH-MM.wav
-# Esto asegura nombres de archivo únicos y organización cronológica
-timestamp = datetime.now()
-nombre_archivo = timestamp.strftime("grabacion_%Y-%m-%d_%H-%M")
-archivo_audio = os.path.join(CARPETA_AUDIO, f"{nombre_archivo}.wav")
-
-# Inicializar componentes de grabación de audio
-# Recognizer: Maneja el procesamiento y reconocimiento de audio
-# Microphone: Captura entrada de audio del dispositivo de micrófono predeterminado
-r = sr.Recognizer()
-mic = sr.Microphone()
-
-# Fase de ajuste al ruido ambiente
-# Este paso es crucial para mejorar la calidad de grabación adaptándose al
-# nivel de ruido de fondo del entorno actual
-print("Ajustando al ruido ambiente...")
-with mic as source:
-    r.adjust_for_ambient_noise(source)
-
-# Fase de grabación de audio
-# Graba por la duración especificada y almacena los datos de audio en memoria
-print(f"Grabando por {DURACION_SEGUNDOS} segundos...")
-with mic as source:
-    audio = r.record(source, duration=DURACION_SEGUNDOS)
-
-# Guardar audio en archivo
-# Convierte los datos de audio grabados a formato WAV y los escribe al disco
-# El formato WAV se elige por su compatibilidad y preservación de calidad
-with open(archivo_audio, "wb") as f:
-    f.write(audio.get_wav_data())
-
-print(f"Audio guardado como: {archivo_audio}")
+# Calibración de ruido ambiente persistida entre ejecuciones
+ARCHIVO_CALIBRACION = os.path.join(CARPETA_AUDIO, ".calibracion.json")
+VIGENCIA_CALIBRACION = 6 * 3600  # Recalibrar si el valor guardado supera 6 horas
+
+
+def main():
+    """
+    Graba un clip de audio del micrófono y lo guarda en la carpeta de entrada.
+    """
+    # Crear directorio de audio si no existe
+    # Esto asegura que la ubicación de almacenamiento esté disponible antes de grabar
+    os.makedirs(CARPETA_AUDIO, exist_ok=True)
+
+    # Generar nombre de archivo basado en timestamp
+    # Formato: grabacion_AAAA-MM-DD_HH-MM.wav
+    # Esto asegura nombres de archivo únicos y organización cronológica
+    timestamp = datetime.now()
+    nombre_archivo = timestamp.strftime("grabacion_%Y-%m-%d_%H-%M")
+    archivo_audio = os.path.join(CARPETA_AUDIO, f"{nombre_archivo}.wav")
+
+    # Inicializar componentes de grabación de audio
+    # Recognizer: Maneja el procesamiento y reconocimiento de audio
+    # Microphone: Captura entrada de audio del dispositivo de micrófono predeterminado
+    r = sr.Recognizer()
+    mic = sr.Microphone()
+
+    # Recuperar calibración de ruido ambiente de una ejecución reciente:
+    # adjust_for_ambient_noise escucha ~1 segundo en cada arranque solo para
+    # recalcular el mismo umbral de energía, así que un valor guardado en las
+    # últimas horas se reutiliza y la grabación empieza de inmediato
+    umbral_cacheado = None
+    try:
+        with open(ARCHIVO_CALIBRACION, "r", encoding="utf-8") as f:
+            calibracion = json.load(f)
+        if time.time() - calibracion["ts"] < VIGENCIA_CALIBRACION:
+            umbral_cacheado = calibracion["energy_threshold"]
+    except (OSError, ValueError, KeyError):
+        pass  # Sin calibración previa usable: se recalibra abajo
+
+    # Ajuste al ruido ambiente y grabación en una sola apertura del micrófono:
+    # cada entrada al contexto reabre el dispositivo PortAudio (~100-300ms),
+    # así que ambas fases comparten el mismo stream
+    with mic as source:
+        if umbral_cacheado is not None:
+            r.energy_threshold = umbral_cacheado
+            r.dynamic_energy_threshold = False
+        else:
+            # Este paso es crucial para mejorar la calidad de grabación
+            # adaptándose al nivel de ruido de fondo del entorno actual
+            print("Ajustando al ruido ambiente...")
+            r.adjust_for_ambient_noise(source)
+            try:
+                with open(ARCHIVO_CALIBRACION, "w", encoding="utf-8") as f:
+                    json.dump({"energy_threshold": r.energy_threshold, "ts": time.time()}, f)
+            except OSError:
+                pass  # Sin caché no se pierde funcionalidad, solo la amortización
+
+        # Graba por la duración especificada y almacena el audio en memoria
+        print(f"Grabando por {DURACION_SEGUNDOS} segundos...")
+        audio = r.record(source, duration=DURACION_SEGUNDOS)
+
+    # Guardar audio en archivo
+    # Convierte los datos de audio grabados a formato WAV y los escribe al disco.
+    # Se remuestrea a 16 kHz / 16 bits al guardar: los reconocedores de voz
+    # trabajan internamente a 16 kHz, así que capturar a 44.1/48 kHz solo
+    # multiplica los bytes en disco y en la subida sin ganar precisión
+    with open(archivo_audio, "wb") as f:
+        f.write(audio.get_wav_data(convert_rate=16000, convert_width=2))
+
+    print(f"Audio guardado como: {archivo_audio}")
+
+
+if __name__ == "__main__":
+    main()
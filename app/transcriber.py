@@ -1,8 +1,8 @@
 """
 Módulo de Transcripción de Audio para la Aplicación de Diario Emocional
 
-Este módulo maneja la funcionalidad de transcripción de audio a texto para la aplicación 
-de diario emocional. Procesa archivos de audio previamente grabados y los convierte a 
+Este módulo maneja la funcionalidad de transcripción de audio a texto para la aplicación
+de diario emocional. Procesa archivos de audio previamente grabados y los convierte a
 texto utilizando el API de Google Speech Recognition.
 
 Dependencias:
@@ -16,85 +16,294 @@ Funcionalidades principales:
     - Guardado del texto transcrito con timestamp
     - Manejo robusto de errores de reconocimiento
 
-Flujo de trabajo:
-    1. Busca el archivo de audio más reciente en la carpeta de entrada
-    2. Configura el reconocedor de voz
-    3. Procesa el archivo de audio
-    4. Transcribe usando Google Speech API
-    5. Guarda el resultado en un archivo de texto con timestamp
+Uso:
+    Como módulo:
+        from app.transcriber import AudioTranscriber
+        texto = AudioTranscriber().transcribe_latest_audio()
+
+    Como script:
+        python -m app.transcriber
 
 Formatos de archivo:
     - Entrada: Archivos WAV en directorio 'audio_inputs'
     - Salida: Archivos TXT en directorio 'text_outputs'
 """
 
-import speech_recognition as sr
+import asyncio
+import hashlib
+import mmap
 import os
+import wave
 from datetime import datetime
 
 # Configuración de directorios
 CARPETA_AUDIO = "audio_inputs"    # Directorio de archivos de audio de entrada
 CARPETA_TEXTO = "text_outputs"    # Directorio de archivos de texto de salida
+CARPETA_CACHE = ".transcription_cache"  # Caché de transcripciones por hash de contenido
+
+
+class AudioTranscriber:
+    """
+    Transcriptor de archivos de audio a texto.
+
+    Encapsula el reconocedor de voz para reutilizarlo entre llamadas
+    (evita reconfigurarlo por archivo) y mantiene las rutas de entrada
+    y salida como estado de la instancia en lugar de constantes sueltas.
+    """
+
+    # Parámetros del filtro de silencio previo al reconocimiento
+    _UMBRAL_RMS = 300        # Energía mínima para considerar un frame con voz
+    _MIN_FRAMES_CON_VOZ = 7  # ~210 ms de voz a frames de 30 ms
+
+    def __init__(self, audio_folder=CARPETA_AUDIO, text_folder=CARPETA_TEXTO):
+        self.audio_folder = audio_folder
+        self.text_folder = text_folder
+        self.cache_folder = CARPETA_CACHE
+        # Importación diferida: speech_recognition arrastra pyaudio y otros
+        # módulos pesados que el menú principal no necesita al arrancar
+        import speech_recognition as sr
+        self._sr = sr
+        self.recognizer = sr.Recognizer()
+
+    def _has_speech(self, audio_file_path):
+        """
+        Detección rápida de voz por energía sobre frames de 30 ms.
+
+        Evita pagar la ida y vuelta completa al servicio por clips de
+        silencio o solo ruido, que terminarían igual en UnknownValueError.
+        Corta en cuanto acumula suficientes frames con voz; ante un
+        formato no analizable deja que el reconocedor decida.
+        """
+        try:
+            # audioop fue eliminado en Python 3.13; sin él se omite el
+            # filtro y todos los clips siguen al reconocedor
+            import audioop
+        except ImportError:
+            return True
+        try:
+            with wave.open(audio_file_path, "rb") as wf:
+                ancho = wf.getsampwidth()
+                muestras_por_frame = int(0.03 * wf.getframerate())
+                frames_con_voz = 0
+                while True:
+                    datos = wf.readframes(muestras_por_frame)
+                    if not datos:
+                        return False
+                    if audioop.rms(datos, ancho) >= self._UMBRAL_RMS:
+                        frames_con_voz += 1
+                        if frames_con_voz >= self._MIN_FRAMES_CON_VOZ:
+                            return True
+        except (wave.Error, OSError, audioop.error):
+            return True
+
+    def _cache_key(self, audio_file_path):
+        """
+        Calcula la clave de caché como hash BLAKE2 del contenido del audio.
+
+        Dos archivos con los mismos bytes comparten transcripción aunque
+        tengan nombres distintos. El archivo se envía al hash por streaming
+        (file_digest o mmap según la versión de Python) en lugar de leerlo
+        entero a un objeto bytes intermedio.
+        """
+        with open(audio_file_path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                digest = hashlib.file_digest(
+                    f, lambda: hashlib.blake2b(digest_size=16)
+                )
+                return digest.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.blake2b(mm, digest_size=16).hexdigest()
+
+    def transcribe_audio_file(self, audio_file_path, language="es-PE"):
+        """
+        Transcribe un archivo WAV y devuelve el texto reconocido.
+
+        Utiliza Google Speech Recognition con configuración para español
+        de Perú. Los resultados se cachean en disco por hash del contenido
+        del audio: repetir un archivo ya transcrito no consume red ni
+        cuota. Devuelve None si el audio no se entiende o si el servicio
+        no está disponible.
+        """
+        # Consultar la caché antes de tocar la red
+        cache_key = self._cache_key(audio_file_path)
+        ruta_cache = os.path.join(self.cache_folder, cache_key + ".txt")
+        if os.path.exists(ruta_cache):
+            with open(ruta_cache, "r", encoding="utf-8") as f:
+                texto = f.read()
+            print("Transcripción recuperada de caché para:", audio_file_path)
+            return texto
+
+        # Clips sin voz no gastan red ni cuota
+        if not self._has_speech(audio_file_path):
+            print("Audio sin voz detectable, se omite la transcripción:", audio_file_path)
+            return None
+
+        # AudioFile maneja automáticamente la apertura y cierre del archivo
+        with self._sr.AudioFile(audio_file_path) as source:
+            audio = self.recognizer.record(source)
+
+        try:
+            print("Reconociendo texto desde:", audio_file_path)
+            texto = self.recognizer.recognize_google(audio, language=language)
+            print("Texto reconocido:", texto)
+
+            os.makedirs(self.cache_folder, exist_ok=True)
+            with open(ruta_cache, "w", encoding="utf-8") as f:
+                f.write(texto)
+            return texto
+
+        except self._sr.UnknownValueError:
+            print("No se pudo entender el audio.")
+            print("Posibles causas: audio poco claro, ruido excesivo, o idioma no reconocido.")
+        except self._sr.RequestError as e:
+            print(f"Error con Google Speech: {e}")
+            print("Verifica tu conexión a internet y la disponibilidad del servicio.")
+        return None
+
+    async def transcribe_all_async(self, audio_file_paths, max_concurrent=5):
+        """
+        Transcribe varios archivos de audio en paralelo.
+
+        Cada transcripción es una llamada de red independiente, así que
+        ejecutarlas concurrentes reduce el tiempo total de N x latencia a
+        aproximadamente una latencia. El semáforo limita cuántas llamadas
+        simultáneas se envían al servicio. Devuelve los textos en el mismo
+        orden que las rutas de entrada; las transcripciones fallidas
+        aparecen como None.
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _transcribe_one(path):
+            async with sem:
+                # El reconocimiento es bloqueante; se delega a un hilo para
+                # no frenar el resto de las transcripciones en curso
+                return await asyncio.to_thread(self.transcribe_audio_file, path)
+
+        tasks = [_transcribe_one(path) for path in audio_file_paths]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [None if isinstance(r, Exception) else r for r in results]
+
+    def transcribe_all(self, audio_file_paths, max_concurrent=5):
+        """
+        Versión síncrona de transcribe_all_async para código sin event loop.
+        """
+        return asyncio.run(self.transcribe_all_async(audio_file_paths, max_concurrent))
+
+    def transcribe_latest_audio(self):
+        """
+        Transcribe el archivo de audio más reciente de la carpeta de entrada.
+
+        Selecciona el WAV con timestamp de creación más alto, lo transcribe
+        y guarda el resultado en la carpeta de texto. Devuelve el texto
+        reconocido o None si no hay archivos o la transcripción falla.
+        """
+        if not os.path.isdir(self.audio_folder):
+            print("No se encontraron archivos de audio en", self.audio_folder)
+            return None
+
+        # Seleccionar el archivo más reciente con un solo recorrido de
+        # scandir: cada DirEntry trae su stat cacheado, así que no hace
+        # falta un getctime (un stat extra) por archivo como con listdir
+        with os.scandir(self.audio_folder) as it:
+            entrada_mas_reciente = max(
+                (e for e in it if e.name.endswith(".wav") and e.is_file()),
+                key=lambda e: e.stat().st_ctime,
+                default=None
+            )
+
+        if entrada_mas_reciente is None:
+            print("No se encontraron archivos de audio en", self.audio_folder)
+            return None
+
+        texto = self.transcribe_audio_file(entrada_mas_reciente.path)
+        if texto:
+            self.save_transcription(texto, os.path.splitext(entrada_mas_reciente.name)[0])
+        return texto
+
+    def save_transcription(self, text, base_name):
+        """
+        Guarda el texto transcrito en un archivo con encabezado de timestamp.
+
+        Mantiene el mismo nombre base que el archivo de audio pero con
+        extensión .txt. Devuelve la ruta del archivo creado.
+        """
+        os.makedirs(self.text_folder, exist_ok=True)
+
+        fecha_hora_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ruta_texto = os.path.join(self.text_folder, base_name + ".txt")
+
+        with open(ruta_texto, "w", encoding="utf-8") as f:
+            f.write(f"Fecha y hora de transcripción: {fecha_hora_str}\n")
+            f.write("Texto reconocido:\n")
+            f.write(text)
+
+        print(f"Texto guardado en: {ruta_texto}")
+        return ruta_texto
+
+
+class WhisperTranscriber(AudioTranscriber):
+    """
+    Transcriptor local basado en faster-whisper (dependencia opcional).
+
+    Elimina la latencia de red y el consumo de cuota del API de Google
+    ejecutando el modelo Whisper en la máquina local con pesos
+    cuantizados a int8. Mantiene la misma interfaz que AudioTranscriber,
+    así que ambos backends son intercambiables.
+    """
+
+    def __init__(self, audio_folder=CARPETA_AUDIO, text_folder=CARPETA_TEXTO,
+                 model_size="small"):
+        super().__init__(audio_folder, text_folder)
+        # Importación en el constructor: faster-whisper es opcional y solo
+        # se paga su carga cuando este backend se usa de verdad
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(
+            model_size,
+            device="auto",
+            compute_type="int8",
+            num_workers=max(1, (os.cpu_count() or 2) // 2)
+        )
+
+    def transcribe_audio_file(self, audio_file_path, language="es"):
+        """
+        Transcribe un archivo WAV localmente y devuelve el texto reconocido.
+
+        El filtro VAD descarta tramos sin voz antes de decodificar y
+        beam_size=1 (búsqueda voraz) prioriza latencia sobre precisión
+        marginal. Devuelve None si la transcripción falla.
+        """
+        try:
+            print("Reconociendo texto desde:", audio_file_path)
+            segments, _ = self.model.transcribe(
+                audio_file_path,
+                language=language,
+                beam_size=1,
+                vad_filter=True
+            )
+            texto = " ".join(segment.text.strip() for segment in segments).strip()
+            print("Texto reconocido:", texto)
+            return texto or None
+        except Exception as e:
+            print(f"Error en transcripción local: {e}")
+            return None
+
+
+def create_transcriber(audio_folder=CARPETA_AUDIO, text_folder=CARPETA_TEXTO):
+    """
+    Crea el transcriptor según la variable de entorno TRANSCRIBER_BACKEND.
+
+    Con TRANSCRIBER_BACKEND=whisper se usa el backend local si
+    faster-whisper está instalado; en cualquier otro caso (o si la
+    importación falla) se mantiene el backend de Google existente.
+    """
+    if os.environ.get("TRANSCRIBER_BACKEND", "google").lower() == "whisper":
+        try:
+            return WhisperTranscriber(audio_folder, text_folder)
+        except ImportError:
+            print("faster-whisper no está instalado, se usa Google Speech.")
+    return AudioTranscriber(audio_folder, text_folder)
+
 
-# Crear directorio de salida si no existe
-# Garantiza que el directorio de destino esté disponible para guardar transcripciones
-os.makedirs(CARPETA_TEXTO, exist_ok=True)
-
-# Búsqueda del archivo de audio más reciente
-# Filtra solo archivos WAV y selecciona el más reciente basado en fecha de creación
-archivos = [f for f in os.listdir(CARPETA_AUDIO) if f.endswith(".wav")]
-
-# Verificar que existan archivos de audio para procesar
-if not archivos:
-    print("No se encontraron archivos de audio en", CARPETA_AUDIO)
-    exit()
-
-# Seleccionar el archivo más reciente usando timestamp de creación
-archivo_mas_reciente = max(archivos, key=lambda f: os.path.getctime(os.path.join(CARPETA_AUDIO, f)))
-ruta_audio = os.path.join(CARPETA_AUDIO, archivo_mas_reciente)
-
-# Configuración de archivo de salida
-# Genera timestamp para el encabezado del archivo de transcripción
-timestamp = datetime.now()
-fecha_hora_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-
-# Crear nombre del archivo de texto basado en el archivo de audio
-# Mantiene el mismo nombre base pero cambia la extensión a .txt
-nombre_txt = os.path.splitext(archivo_mas_reciente)[0] + ".txt"
-ruta_texto = os.path.join(CARPETA_TEXTO, nombre_txt)
-
-# Proceso de reconocimiento de voz
-# Inicializar el reconocedor de speech recognition
-r = sr.Recognizer()
-
-# Cargar y procesar el archivo de audio
-# AudioFile context manager maneja automáticamente la apertura y cierre del archivo
-with sr.AudioFile(ruta_audio) as source:
-    audio = r.record(source)
-
-# Intentar transcripción con manejo de errores
-try:
-    print("Reconociendo texto desde:", ruta_audio)
-    
-    # Utilizar Google Speech Recognition API con configuración para español de Perú
-    # El parámetro language="es-PE" optimiza el reconocimiento para dialectos peruanos
-    texto = r.recognize_google(audio, language="es-PE")
-    print("Texto reconocido:", texto)
-
-    # Guardar transcripción en archivo de texto
-    # Incluye timestamp y formato estructurado para fácil lectura
-    with open(ruta_texto, "w", encoding="utf-8") as f:
-        f.write(f"Fecha y hora de transcripción: {fecha_hora_str}\n")
-        f.write("Texto reconocido:\n")
-        f.write(texto)
-    
-    print(f"Texto guardado en: {ruta_texto}")
-
-# Manejo de errores específicos del reconocimiento de voz
-except sr.UnknownValueError:
-    print("No se pudo entender el audio.")
-    print("Posibles causas: audio poco claro, ruido excesivo, o idioma no reconocido.")
-    
-except sr.RequestError as e:
-    print(f"Error con Google Speech: {e}")
-    print("Verifica tu conexión a internet y la disponibilidad del servicio.")
+if __name__ == "__main__":
+    transcriber = create_transcriber()
+    transcriber.transcribe_latest_audio()
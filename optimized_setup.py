@@ -35,15 +35,19 @@ def print_step(step, description):
     """
     print(f"\n{step} {description}...")
 
-def run_command_with_timing(command, description):
+def run_command_with_timing(argv, description):
     """
-    Ejecuta un comando midiendo el tiempo.
+    Ejecuta un comando (lista de argumentos) midiendo el tiempo.
+
+    Recibe el comando como lista argv y ejecuta sin shell: se evita el
+    proceso /bin/sh intermedio y cualquier interpretación de
+    metacaracteres en los nombres de paquete.
     """
     print(f"\n⏱️  {description}...")
     start_time = time.time()
-    
+
     try:
-        result = subprocess.run(command, shell=True, check=True, 
+        result = subprocess.run(argv, check=True,
                               capture_output=True, text=True)
         end_time = time.time()
         elapsed = end_time - start_time
@@ -67,19 +71,16 @@ def install_core_dependencies():
         "python-dotenv==1.0.0"
     ]
     
-    total_time = 0
-    
-    for package in core_packages:
-        success, elapsed = run_command_with_timing(
-            f"{sys.executable} -m pip install {package}",
-            f"Instalando {package.split('==')[0]}"
-        )
-        total_time += elapsed
-        if not success:
-            return False
-    
-    print(f"\n📊 Tiempo total instalación core: {total_time:.2f}s")
-    return True
+    # Una sola invocación de pip para todo el grupo: el resolutor de
+    # dependencias corre una vez y las descargas comparten la misma
+    # conexión a PyPI, en lugar de pagar arranque y resolución por paquete
+    success, elapsed = run_command_with_timing(
+        [sys.executable, "-m", "pip", "install", *core_packages],
+        f"Instalando {', '.join(p.split('==')[0] for p in core_packages)}"
+    )
+
+    print(f"\n📊 Tiempo total instalación core: {elapsed:.2f}s")
+    return success
 
 def install_optional_dependencies():
     """
@@ -114,14 +115,14 @@ def install_optional_dependencies():
     user_choice = input("\n¿Instalar todas las categorías? (s/n): ").lower()
     
     if user_choice == 's':
-        # Instalar todas
+        # Instalar todas: una invocación de pip por categoría en lugar de
+        # una por paquete (resolución y sesión HTTP compartidas)
         for category, packages in categories.items():
             print(f"\n📦 Instalando categoría: {category}")
-            for package in packages:
-                run_command_with_timing(
-                    f"{sys.executable} -m pip install {package}",
-                    f"  └─ {package.split('==')[0]}"
-                )
+            run_command_with_timing(
+                [sys.executable, "-m", "pip", "install", *packages],
+                f"  └─ {', '.join(p.split('==')[0] for p in packages)}"
+            )
     else:
         # Instalación selectiva
         print("\n🎯 Instalación Selectiva:")
@@ -137,11 +138,10 @@ def install_optional_dependencies():
                 packages = list(categories.values())[idx]
                 
                 print(f"\n📦 Instalando: {category_name}")
-                for package in packages:
-                    run_command_with_timing(
-                        f"{sys.executable} -m pip install {package}",
-                        f"  └─ {package.split('==')[0]}"
-                    )
+                run_command_with_timing(
+                    [sys.executable, "-m", "pip", "install", *packages],
+                    f"  └─ {', '.join(p.split('==')[0] for p in packages)}"
+                )
             except (ValueError, IndexError):
                 print(f"❌ Opción inválida: {choice}")
 
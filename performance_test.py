@@ -16,24 +16,38 @@ Uso:
 
 import time
 import sys
-import importlib
-from memory_profiler import profile
+import subprocess
 
 def measure_import_time(module_name, description):
     """
-    Mide el tiempo que tarda en importar un módulo.
+    Mide el tiempo de importación de un módulo en un intérprete limpio.
+
+    Cada medición lanza un subproceso con -X importtime: en el proceso
+    actual una segunda importación del mismo módulo solo consulta
+    sys.modules, así que los números de las pruebas posteriores no
+    medirían el costo real de carga.
     """
-    start_time = time.time()
-    try:
-        importlib.import_module(module_name)
-        end_time = time.time()
-        import_time = (end_time - start_time) * 1000  # En milisegundos
-        print(f"✅ {description}: {import_time:.2f}ms")
-        return import_time
-    except Exception as e:
-        print(f"❌ Error importando {module_name}: {e}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "desconocido"
+        print(f"❌ Error importando {module_name}: {error}")
         return 0
 
+    # -X importtime escribe en stderr líneas con el formato:
+    #   import time: self [us] | cumulative | nombre_del_modulo
+    import_time = 0.0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module_name:
+            import_time = int(parts[1].strip()) / 1000  # µs a ms
+            break
+
+    print(f"✅ {description}: {import_time:.2f}ms")
+    return import_time
+
 def test_traditional_loading():
     """
     Simula la carga tradicional de todas las librerías al inicio.
@@ -2,21 +2,39 @@
 import pandas as pd
 import re
 
+# Patrones de limpieza compilados una sola vez a nivel de módulo
+_RE_URL = re.compile(r"http\S+")            # quitar URLs
+_RE_MENTION = re.compile(r"@\w+")           # quitar menciones
+_RE_KEEP = re.compile(r"[^a-záéíóúñü\s]")   # solo letras y espacios
+_RE_WS = re.compile(r"\s+")                 # quitar espacios extras
+
 def clean_text(text):
     text = text.lower()
-    text = re.sub(r"http\S+", "", text)         # quitar URLs
-    text = re.sub(r"@\w+", "", text)            # quitar menciones
-    text = re.sub(r"[^a-záéíóúñü\s]", "", text)  # solo letras y espacios
-    text = re.sub(r"\s+", " ", text).strip()    # quitar espacios extras
+    text = _RE_URL.sub("", text)
+    text = _RE_MENTION.sub("", text)
+    text = _RE_KEEP.sub("", text)
+    text = _RE_WS.sub(" ", text).strip()
     return text
 
 def preprocess_dataset(input_path, output_path):
-    df = pd.read_csv(input_path)
+    # Parser pyarrow (multihilo) cuando está disponible; el parser C por
+    # defecto sigue cubriendo los entornos sin pyarrow instalado
+    try:
+        df = pd.read_csv(input_path, engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv(input_path)
 
     if 'text' not in df.columns or 'emotion' not in df.columns:
         raise ValueError("El CSV debe tener columnas 'text' y 'emotion'")
 
-    df['text'] = df['text'].astype(str).apply(clean_text)
+    # Limpieza vectorizada con Series.str: cada paso recorre la columna
+    # entera en C en lugar de despachar clean_text fila por fila
+    s = df['text'].astype(str).str.lower()
+    s = s.str.replace(_RE_URL, "", regex=True)
+    s = s.str.replace(_RE_MENTION, "", regex=True)
+    s = s.str.replace(_RE_KEEP, "", regex=True)
+    df['text'] = s.str.replace(_RE_WS, " ", regex=True).str.strip()
+
     df.dropna(subset=['text', 'emotion'], inplace=True)
     df.to_csv(output_path, index=False)
     print(f"Preprocesamiento completado. Guardado en {output_path}")
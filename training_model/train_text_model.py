@@ -1,7 +1,7 @@
 if __name__ == '__main__':
     import pandas as pd
     from datasets import Dataset
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer, DataCollatorWithPadding
     from sklearn.preprocessing import LabelEncoder
     import torch
     import numpy as np
@@ -9,7 +9,12 @@ if __name__ == '__main__':
     import os
 
     # Entrenamiento con optimización incluida
-    df = pd.read_csv("./training_model/datasets/dataset.csv")
+    # Parser pyarrow (multihilo) cuando está disponible; el parser C por
+    # defecto sigue cubriendo los entornos sin pyarrow instalado
+    try:
+        df = pd.read_csv("./training_model/datasets/dataset.csv", engine="pyarrow")
+    except (ImportError, ValueError):
+        df = pd.read_csv("./training_model/datasets/dataset.csv")
     label_encoder = LabelEncoder()
     df['label'] = label_encoder.fit_transform(df['emotion'])
 
@@ -17,15 +22,34 @@ if __name__ == '__main__':
     model_name = "distilbert-base-uncased"
     tokenizer = AutoTokenizer.from_pretrained(model_name)
 
+    # Longitud de truncado basada en el percentil 95 del corpus real
+    # (muestreado): los pocos textos atípicamente largos no obligan a
+    # arrastrar 128 tokens de atención por todo el entrenamiento
+    sample_texts = df['text'].sample(min(len(df), 2000), random_state=0)
+    p95 = int(np.percentile([len(tokenizer.tokenize(t)) for t in sample_texts], 95))
+    max_length = min(128, max(32, p95))
+    print(f"Longitud máxima de tokenización: {max_length} (p95={p95})")
+
+    # Sin padding en el map: el collator rellena cada lote solo hasta su
+    # secuencia más larga en vez de 128 tokens fijos por ejemplo
     def tokenize(batch):
-        return tokenizer(batch["text"], padding="max_length", truncation=True, max_length=128)
+        encoded = tokenizer(batch["text"], truncation=True, max_length=max_length)
+        # Longitud por ejemplo para que group_by_length arme lotes de
+        # secuencias parecidas sin recalcularla en cada época
+        encoded["length"] = [len(ids) for ids in encoded["input_ids"]]
+        return encoded
 
-    tokenized_dataset = dataset.map(tokenize, batched=True)
+    tokenized_dataset = dataset.map(tokenize, batched=True, num_proc=os.cpu_count())
     tokenized_dataset = tokenized_dataset.train_test_split(test_size=0.2)
     tokenized_dataset = tokenized_dataset.remove_columns(["text"])
 
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     print(device)
+
+    # Precisión mixta: bf16 en GPUs Ampere o posteriores (mismo rendimiento
+    # que fp16 pero sin loss scaler); fp16 como alternativa en GPUs previas
+    use_cuda = torch.cuda.is_available()
+    use_bf16 = use_cuda and torch.cuda.is_bf16_supported()
     model = AutoModelForSequenceClassification.from_pretrained(
         model_name,
         num_labels=len(label_encoder.classes_)
@@ -42,8 +66,13 @@ if __name__ == '__main__':
         num_train_epochs=2,
         warmup_steps=0,
         weight_decay=0.01,
-        fp16=torch.cuda.is_available(),
+        bf16=use_bf16,
+        fp16=use_cuda and not use_bf16,
+        # AdamW fusionado: un kernel por paso del optimizador en GPU
+        optim="adamw_torch_fused" if use_cuda else "adamw_torch",
         dataloader_num_workers=2,  # ✅ Este valor requiere el bloque __main__ en Windows
+        group_by_length=True,  # Lotes de longitudes parecidas: menos padding
+        length_column_name="length",
         disable_tqdm=True
     )
 
@@ -53,12 +82,16 @@ if __name__ == '__main__':
         acc = np.mean(preds == labels)
         return {"accuracy": acc}
 
+    # Padding dinámico por lote (múltiplo de 8 para los tensor cores)
+    data_collator = DataCollatorWithPadding(tokenizer, pad_to_multiple_of=8)
+
     trainer = Trainer(
         model=model,
         args=training_args,
         train_dataset=tokenized_dataset["train"],
         eval_dataset=tokenized_dataset["test"],
         tokenizer=tokenizer,
+        data_collator=data_collator,
         compute_metrics=compute_metrics
     )
 